@@ -0,0 +1,66 @@
+"""Use JSONB for plan and session data, add GIN index on idea tags
+
+Revision ID: 1deb1ee362ba
+Revises: 48fc8d01a84e
+Create Date: 2026-10-16 10:03:17.542916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '1deb1ee362ba'
+down_revision: Union[str, None] = '48fc8d01a84e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('refinement_sessions', 'questions',
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               postgresql_using='questions::jsonb',
+               existing_nullable=False)
+    op.alter_column('refinement_sessions', 'answers',
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               postgresql_using='answers::jsonb',
+               existing_nullable=True)
+    op.alter_column('plans', 'steps',
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               postgresql_using='steps::jsonb',
+               existing_nullable=False)
+    op.alter_column('plans', 'resources',
+               existing_type=postgresql.JSON(astext_type=sa.Text()),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               postgresql_using='resources::jsonb',
+               existing_nullable=True)
+    op.create_index('idx_ideas_tags_gin', 'ideas', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ideas_tags_gin', table_name='ideas', postgresql_using='gin')
+    op.alter_column('plans', 'resources',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               postgresql_using='resources::json',
+               existing_nullable=True)
+    op.alter_column('plans', 'steps',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               postgresql_using='steps::json',
+               existing_nullable=False)
+    op.alter_column('refinement_sessions', 'answers',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               postgresql_using='answers::json',
+               existing_nullable=True)
+    op.alter_column('refinement_sessions', 'questions',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=postgresql.JSON(astext_type=sa.Text()),
+               postgresql_using='questions::json',
+               existing_nullable=False)
@@ -0,0 +1,28 @@
+"""Add pg_trgm GIN indexes for idea title/description search
+
+Revision ID: 3a9d5e6b7c12
+Revises: e7b24c9f1a03
+Create Date: 2026-10-16 15:40:12.664019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a9d5e6b7c12'
+down_revision: Union[str, None] = 'e7b24c9f1a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('idx_ideas_title_trgm', 'ideas', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('idx_ideas_description_trgm', 'ideas', ['original_description'], unique=False, postgresql_using='gin', postgresql_ops={'original_description': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ideas_description_trgm', table_name='ideas', postgresql_using='gin', postgresql_ops={'original_description': 'gin_trgm_ops'})
+    op.drop_index('idx_ideas_title_trgm', table_name='ideas', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
@@ -0,0 +1,28 @@
+"""Add active plan and latest session indexes
+
+Revision ID: 48fc8d01a84e
+Revises: 5217e0e5cb29
+Create Date: 2026-10-16 09:12:44.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48fc8d01a84e'
+down_revision: Union[str, None] = '5217e0e5cb29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_plans_idea_active', 'plans', ['idea_id'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('idx_refinement_sessions_idea_created', 'refinement_sessions', ['idea_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_refinement_sessions_idea_created', table_name='refinement_sessions')
+    op.drop_index('idx_plans_idea_active', table_name='plans', postgresql_where=sa.text('is_active'))
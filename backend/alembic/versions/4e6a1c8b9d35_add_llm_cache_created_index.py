@@ -0,0 +1,25 @@
+"""Add llm_cache created_at index for purging expired entries
+
+Revision ID: 4e6a1c8b9d35
+Revises: d8f3b6a1e2c4
+Create Date: 2026-10-16 18:05:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e6a1c8b9d35'
+down_revision: Union[str, None] = 'd8f3b6a1e2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_llm_cache_created', 'llm_cache', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_llm_cache_created', table_name='llm_cache')
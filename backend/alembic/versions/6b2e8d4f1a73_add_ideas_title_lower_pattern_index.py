@@ -0,0 +1,25 @@
+"""Add lower(title) text_pattern_ops index for idea title prefix search
+
+Revision ID: 6b2e8d4f1a73
+Revises: 7f1b3e9a4c60
+Create Date: 2026-10-16 20:03:51.274618
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b2e8d4f1a73'
+down_revision: Union[str, None] = '7f1b3e9a4c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE INDEX idx_ideas_title_lower_pattern ON ideas (lower(title) text_pattern_ops)')
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX idx_ideas_title_lower_pattern')
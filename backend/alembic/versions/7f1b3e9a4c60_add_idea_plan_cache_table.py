@@ -0,0 +1,44 @@
+"""Add pgvector idea_plan_cache table for the opt-in semantic plan cache
+
+Revision ID: 7f1b3e9a4c60
+Revises: 4e6a1c8b9d35
+Create Date: 2026-10-16 19:12:27.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f1b3e9a4c60'
+down_revision: Union[str, None] = '4e6a1c8b9d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The semantic cache is opt-in: servers without pgvector skip this revision, and
+    # manual_migration creates the table at startup if the cache is enabled later
+    bind = op.get_bind()
+    if bind.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")).first() is None:
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    # 1536 dimensions matches the default text-embedding-3-small embeddings
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS idea_plan_cache (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            idea_id UUID NOT NULL REFERENCES ideas(id) ON DELETE CASCADE,
+            embedding VECTOR(1536) NOT NULL,
+            plan_json TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute('CREATE INDEX IF NOT EXISTS idx_idea_plan_cache_embedding ON idea_plan_cache USING hnsw (embedding vector_cosine_ops)')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_idea_plan_cache_idea ON idea_plan_cache (idea_id)')
+    op.execute('CREATE INDEX IF NOT EXISTS idx_idea_plan_cache_created ON idea_plan_cache (created_at)')
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE IF EXISTS idea_plan_cache')
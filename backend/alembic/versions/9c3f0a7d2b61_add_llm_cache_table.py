@@ -0,0 +1,31 @@
+"""Add llm_cache table for cached LLM completions
+
+Revision ID: 9c3f0a7d2b61
+Revises: 1deb1ee362ba
+Create Date: 2026-10-16 14:21:48.305117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f0a7d2b61'
+down_revision: Union[str, None] = '1deb1ee362ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('llm_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('llm_cache')
@@ -0,0 +1,29 @@
+"""Add generated full-text search vector to ideas
+
+Revision ID: b41e8f0c5d27
+Revises: 3a9d5e6b7c12
+Create Date: 2026-10-16 16:08:55.127493
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e8f0c5d27'
+down_revision: Union[str, None] = '3a9d5e6b7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ideas', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', coalesce(original_description, '')), 'B')", persisted=True), nullable=True))
+    op.create_index('idx_ideas_search_vector', 'ideas', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ideas_search_vector', table_name='ideas', postgresql_using='gin')
+    op.drop_column('ideas', 'search_vector')
@@ -0,0 +1,25 @@
+"""Add ideas updated_at/id index for keyset pagination
+
+Revision ID: c5d2a8e4f916
+Revises: b41e8f0c5d27
+Create Date: 2026-10-16 16:41:12.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2a8e4f916'
+down_revision: Union[str, None] = 'b41e8f0c5d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_ideas_updated_id', 'ideas', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ideas_updated_id', table_name='ideas')
@@ -0,0 +1,31 @@
+"""Cascade idea deletes to refinement sessions and plans
+
+Revision ID: d8f3b6a1e2c4
+Revises: c5d2a8e4f916
+Create Date: 2026-10-16 16:58:30.271946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3b6a1e2c4'
+down_revision: Union[str, None] = 'c5d2a8e4f916'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('refinement_sessions_idea_id_fkey', 'refinement_sessions', type_='foreignkey')
+    op.create_foreign_key('refinement_sessions_idea_id_fkey', 'refinement_sessions', 'ideas', ['idea_id'], ['id'], ondelete='CASCADE')
+    op.drop_constraint('plans_idea_id_fkey', 'plans', type_='foreignkey')
+    op.create_foreign_key('plans_idea_id_fkey', 'plans', 'ideas', ['idea_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    op.drop_constraint('plans_idea_id_fkey', 'plans', type_='foreignkey')
+    op.create_foreign_key('plans_idea_id_fkey', 'plans', 'ideas', ['idea_id'], ['id'])
+    op.drop_constraint('refinement_sessions_idea_id_fkey', 'refinement_sessions', type_='foreignkey')
+    op.create_foreign_key('refinement_sessions_idea_id_fkey', 'refinement_sessions', 'ideas', ['idea_id'], ['id'])
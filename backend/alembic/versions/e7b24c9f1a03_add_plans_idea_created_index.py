@@ -0,0 +1,25 @@
+"""Add plans idea/created_at index for newest-first listing
+
+Revision ID: e7b24c9f1a03
+Revises: 9c3f0a7d2b61
+Create Date: 2026-10-16 15:02:37.910284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b24c9f1a03'
+down_revision: Union[str, None] = '9c3f0a7d2b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_plans_idea_created', 'plans', ['idea_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_plans_idea_created', table_name='plans')
@@ -2,11 +2,14 @@
 Updated API routes for idea management - New Architecture
 """
 import logging
+import threading
+import time
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, exists, func, insert, or_, select, tuple_, update
 
 from database import get_db
 from models import Idea, RefinementSession, Plan, IdeaStatus
@@ -20,6 +23,40 @@ from schemas import (
 router = APIRouter(prefix="/ideas", tags=["ideas"])
 logger = logging.getLogger(__name__)
 
+# Recent ideas per limit, kept briefly so bursts of dashboard loads share one query.
+# Writes through this router bump the version, which invalidates every entry; other
+# writers (status changes during refinement/planning) are covered by the short TTL.
+# The cache is per process: with several uvicorn workers a write only invalidates its
+# own worker, so other workers may serve results up to RECENT_IDEAS_TTL stale
+RECENT_IDEAS_TTL = 2.0  # seconds
+recent_ideas_cache = {}  # limit -> (expires_at, version, response)
+ideas_version = 0
+# Sync handlers run in the threadpool, so reads and writes of the cache state are locked
+recent_ideas_lock = threading.Lock()
+
+# Larger imports should be split client-side; bigger requests are rejected with 422
+MAX_BULK_IDEAS = 500
+
+
+def _invalidate_recent_ideas():
+    """Invalidate cached recent ideas after a write"""
+    global ideas_version
+    with recent_ideas_lock:
+        ideas_version += 1
+
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input matches literally (backslash is the default escape)"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _get_idea_with_relations(db: Session, idea_id: UUID) -> Optional[Idea]:
+    """Load an idea with its sessions and plans in one IN-query per relationship"""
+    return db.query(Idea).options(
+        selectinload(Idea.refinement_sessions),
+        selectinload(Idea.plans)
+    ).filter(Idea.id == idea_id).first()
+
 @router.post("/", response_model=IdeaResponse)
 def create_idea(
     idea: IdeaCreate,
@@ -71,7 +108,6 @@ def create_idea(
             
             db.add(db_idea)
             db.commit()
-            db.refresh(db_idea)
             
         except Exception as column_error:
             logger.warning(f"Failed to create idea with is_unrefined field: {column_error}")
@@ -100,6 +136,7 @@ def create_idea(
             # Fetch the created idea
             db_idea = db.query(Idea).filter(Idea.id == idea_id).first()
         
+        _invalidate_recent_ideas()
         logger.info(f"Successfully created idea with ID: {db_idea.id}")
         
         # Return with computed fields
@@ -124,6 +161,56 @@ def create_idea(
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create idea: {str(e)}")
 
+@router.post("/bulk", response_model=List[IdeaResponse])
+def create_ideas_bulk(
+    ideas: List[IdeaCreate] = Body(..., max_length=MAX_BULK_IDEAS),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many ideas at once (imports, seeding) with a single INSERT ... RETURNING
+    At most MAX_BULK_IDEAS ideas per request
+    """
+    if not ideas:
+        return []
+    
+    try:
+        rows = [
+            {
+                "title": idea.title.strip(),
+                "original_description": idea.original_description.strip(),
+                "tags": [str(tag).strip() for tag in idea.tags if tag and str(tag).strip()],
+                "status": IdeaStatus.captured,
+                "is_unrefined": idea.is_unrefined
+            }
+            for idea in ideas
+        ]
+        # One statement and one transaction for the whole batch; RETURNING hands back
+        # the generated ids and timestamps without a SELECT per row
+        created = db.scalars(insert(Idea).returning(Idea), rows).all()
+        # Built before commit, which expires the returned objects
+        response_ideas = [
+            IdeaResponse(
+                id=idea.id,
+                title=idea.title,
+                original_description=idea.original_description,
+                tags=idea.tags,
+                status=idea.status.value,
+                is_unrefined=idea.is_unrefined or False,
+                created_at=idea.created_at,
+                updated_at=idea.updated_at
+            )
+            for idea in created
+        ]
+        db.commit()
+        _invalidate_recent_ideas()
+        logger.info(f"Bulk created {len(response_ideas)} ideas")
+    except Exception as e:
+        logger.error(f"Failed to bulk create ideas: {e}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to create ideas: {str(e)}")
+    
+    return response_ideas
+
 @router.get("/", response_model=List[IdeaResponse])
 def get_ideas(
     skip: int = Query(0, ge=0),
@@ -131,26 +218,27 @@ def get_ideas(
     search: Optional[str] = Query(None),
     tags: Optional[List[str]] = Query(None),
     status: Optional[str] = Query(None),
+    before: Optional[datetime] = Query(None),
+    before_id: Optional[UUID] = Query(None),
     db: Session = Depends(get_db)
 ):
     """
     Get ideas with optional filtering and related data counts
+    Pass the updated_at and id of the last idea received as `before` and `before_id`
+    to fetch the next page (`skip` is ignored with a cursor); `skip` alone still works
+    but gets slower the deeper it goes
     """
+    if before_id is not None and before is None:
+        raise HTTPException(status_code=422, detail="before_id requires before")
+    
     try:
         query = db.query(Idea)
         
         # Apply filters
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (Idea.title.ilike(search_term)) |
-                (Idea.original_description.ilike(search_term))
-            )
-        
         if tags:
-            # Filter by tags (JSON array contains any of the specified tags)
-            for tag in tags:
-                query = query.filter(func.json_array_length(Idea.tags.op('?')(tag)) > 0)
+            # Filter by tags: a single tags @> ARRAY[...] predicate (every given tag
+            # must be present), served by the GIN index on tags
+            query = query.filter(Idea.tags.contains(tags))
         
         if status:
             try:
@@ -159,11 +247,56 @@ def get_ideas(
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        # Order by most recent first
-        query = query.order_by(Idea.updated_at.desc())
-        
-        # Apply pagination
-        ideas = query.offset(skip).limit(limit).all()
+        if search and search.strip():
+            search_term = search.strip()
+            prefix_match = func.lower(Idea.title).like(f"{_escape_like(search_term.lower())}%")
+            ideas = None
+            if len(search_term.split()) == 1:
+                # Single word: titles starting with it come first, so try a range scan on the
+                # lower(title) pattern index; it answers the page alone when it fills it
+                ideas = query.filter(prefix_match).order_by(
+                    Idea.updated_at.desc(),
+                    Idea.id.desc()
+                ).offset(skip).limit(limit).all()
+                if len(ideas) < limit:
+                    ideas = None
+            
+            if ideas is None:
+                search_query = func.plainto_tsquery('english', search_term)
+                # Full-text search matches stemmed whole words, so substring matches are
+                # kept alongside it (served by the trigram indexes): "auth" still finds
+                # "authentication"
+                substring = f"%{_escape_like(search_term)}%"
+                query = query.filter(or_(
+                    Idea.search_vector.op('@@')(search_query),
+                    Idea.title.ilike(substring),
+                    Idea.original_description.ilike(substring)
+                ))
+                # Title prefix matches first, in the same order as the fast path above so
+                # pages agree whichever path served them; the rest by full-text relevance
+                query = query.order_by(
+                    prefix_match.desc(),
+                    case((prefix_match, 0.0), else_=func.ts_rank(Idea.search_vector, search_query)).desc(),
+                    Idea.updated_at.desc(),
+                    Idea.id.desc()
+                )
+                
+                # Apply pagination
+                ideas = query.offset(skip).limit(limit).all()
+        else:
+            # Most recent first. Keyset pagination: seek past the cursor on the
+            # (updated_at, id) index instead of generating and discarding skipped rows
+            if before is not None:
+                if before_id is not None:
+                    query = query.filter(tuple_(Idea.updated_at, Idea.id) < tuple_(before, before_id))
+                else:
+                    query = query.filter(Idea.updated_at < before)
+            query = query.order_by(Idea.updated_at.desc(), Idea.id.desc())
+            
+            # Apply pagination; the cursor already positions the page, so skip only applies without one
+            if before is None:
+                query = query.offset(skip)
+            ideas = query.limit(limit).all()
         
         # Build response with computed fields (simplified for initial deployment)
         response_ideas = []
@@ -196,13 +329,13 @@ def get_idea_stats(db: Session = Depends(get_db)):
     Get statistics about ideas (simplified for initial deployment)
     """
     try:
-        total_ideas = db.query(Idea).count()
-        
-        # Count by status
-        status_counts = {}
-        for status in IdeaStatus:
-            count = db.query(Idea).filter(Idea.status == status).count()
-            status_counts[status.value] = count
+        # Total and per-status counts from one aggregate row (COUNT(*) FILTER (WHERE ...))
+        row = db.query(
+            func.count().label("total"),
+            *(func.count().filter(Idea.status == status).label(status.value) for status in IdeaStatus)
+        ).one()
+        total_ideas = row.total
+        status_counts = {status.value: row._mapping[status.value] for status in IdeaStatus}
         
         # Simplified stats until all tables are set up
         return {
@@ -233,6 +366,13 @@ def get_recent_ideas(
     """
     Get recently updated ideas with simplified response
     """
+    with recent_ideas_lock:
+        cached = recent_ideas_cache.get(limit)
+        if cached is not None and cached[0] > time.monotonic() and cached[1] == ideas_version:
+            return list(cached[2])
+        # Taken before querying, so a write that lands mid-query marks this result stale
+        version = ideas_version
+    
     # Get ideas with basic info - handle missing is_unrefined column gracefully
     try:
         ideas = db.query(Idea).order_by(
@@ -280,7 +420,9 @@ def get_recent_ideas(
             has_active_plan=False
         ))
     
-    return response_ideas
+    with recent_ideas_lock:
+        recent_ideas_cache[limit] = (time.monotonic() + RECENT_IDEAS_TTL, version, response_ideas)
+    return list(response_ideas)
 
 @router.get("/{idea_id}", response_model=IdeaDetailResponse)
 def get_idea(
@@ -290,7 +432,7 @@ def get_idea(
     """
     Get a specific idea with full related data
     """
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
+    idea = _get_idea_with_relations(db, idea_id)
     
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
@@ -299,9 +441,9 @@ def get_idea(
     try:
         sessions_count = len(idea.refinement_sessions) if idea.refinement_sessions else 0
         plans_count = len(idea.plans) if idea.plans else 0
-        has_active_plan = idea.active_plan is not None
-        latest_session = idea.latest_session
         active_plan = idea.active_plan
+        has_active_plan = active_plan is not None
+        latest_session = idea.latest_session
     except Exception as e:
         # If relationships fail to load (tables don't exist yet), use defaults
         logger.warning(f"Relationship loading failed for idea {idea.id}: {e}")
@@ -337,36 +479,43 @@ def update_idea(
     """
     Update an existing idea
     """
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
-    
-    if not idea:
-        raise HTTPException(status_code=404, detail="Idea not found")
-    
-    # Update fields if provided
+    # Collect only the fields that were provided
+    values = {}
     if idea_update.title is not None:
-        idea.title = idea_update.title
+        values["title"] = idea_update.title
     
     if idea_update.original_description is not None:
-        idea.original_description = idea_update.original_description
+        values["original_description"] = idea_update.original_description
     
     if idea_update.tags is not None:
-        idea.tags = idea_update.tags
+        values["tags"] = idea_update.tags
     
     if idea_update.status is not None:
         try:
-            idea.status = IdeaStatus(idea_update.status)
+            values["status"] = IdeaStatus(idea_update.status)
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {idea_update.status}")
     
-    db.commit()
-    db.refresh(idea)
+    if values:
+        # UPDATE ... RETURNING: the existence check, the write and the refreshed row
+        # in one statement, without loading the idea first
+        idea = db.scalars(update(Idea).where(Idea.id == idea_id).values(**values).returning(Idea)).first()
+    else:
+        idea = db.query(Idea).filter(Idea.id == idea_id).first()
     
-    # Return response with computed fields
-    sessions_count = len(idea.refinement_sessions)
-    plans_count = len(idea.plans)
-    has_active_plan = idea.active_plan is not None
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    
+    # Return response with computed fields, counted in one query instead of loading
+    # both collections and looking up the active plan separately
+    sessions_count, plans_count, has_active_plan = db.execute(select(
+        select(func.count()).where(RefinementSession.idea_id == idea_id).scalar_subquery(),
+        select(func.count()).where(Plan.idea_id == idea_id).scalar_subquery(),
+        exists().where(Plan.idea_id == idea_id, Plan.is_active == True)
+    )).one()
     
-    return IdeaResponse(
+    # Built before commit, which expires the updated idea
+    response = IdeaResponse(
         id=idea.id,
         title=idea.title,
         original_description=idea.original_description,
@@ -378,6 +527,12 @@ def update_idea(
         plans_count=plans_count,
         has_active_plan=has_active_plan
     )
+    
+    db.commit()
+    if values:
+        _invalidate_recent_ideas()
+    
+    return response
 
 @router.delete("/{idea_id}")
 def delete_idea(
@@ -389,55 +544,21 @@ def delete_idea(
     """
     logger.info(f"Attempting to delete idea: {idea_id}")
     
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
-    
-    if not idea:
+    # Existence check on the primary key only; nothing is loaded into the session
+    if db.query(Idea.id).filter(Idea.id == idea_id).scalar() is None:
         logger.warning(f"Idea not found for deletion: {idea_id}")
         raise HTTPException(status_code=404, detail="Idea not found")
     
     try:
-        # Log what we're about to delete
-        logger.info(f"Deleting idea: {idea.title} (ID: {idea.id})")
-        
-        # Try to get relationship counts before deletion for logging
-        try:
-            sessions_count = len(idea.refinement_sessions) if hasattr(idea, 'refinement_sessions') and idea.refinement_sessions else 0
-            plans_count = len(idea.plans) if hasattr(idea, 'plans') and idea.plans else 0
-            logger.info(f"Idea has {sessions_count} sessions and {plans_count} plans")
-        except Exception as rel_error:
-            logger.warning(f"Could not count relationships: {rel_error}")
-        
         # Handle legacy foreign key constraints from old architecture
         try:
             # Check if old conversations table exists and delete related records
             from sqlalchemy import text
-            logger.info("Checking for legacy conversations table...")
-            
-            result = db.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' AND table_name = 'conversations'
-                );
-            """))
-            conversations_table_exists = result.scalar()
-            logger.info(f"Conversations table exists: {conversations_table_exists}")
+            conversations_table_exists = db.execute(text("SELECT to_regclass('public.conversations') IS NOT NULL")).scalar()
             
             if conversations_table_exists:
-                logger.info("Found legacy conversations table, checking for references to this idea...")
-                
-                # First check how many conversations reference this idea
-                count_result = db.execute(text("SELECT COUNT(*) FROM conversations WHERE idea_id = :idea_id"), {"idea_id": idea.id})
-                conversation_count = count_result.scalar()
-                logger.info(f"Found {conversation_count} conversations referencing idea {idea.id}")
-                
-                if conversation_count > 0:
-                    logger.info(f"Deleting {conversation_count} conversation records for idea {idea.id}...")
-                    delete_result = db.execute(text("DELETE FROM conversations WHERE idea_id = :idea_id"), {"idea_id": idea.id})
-                    logger.info(f"Deleted {delete_result.rowcount} conversation records")
-                else:
-                    logger.info("No conversation records found for this idea")
-            else:
-                logger.info("No legacy conversations table found")
+                delete_result = db.execute(text("DELETE FROM conversations WHERE idea_id = :idea_id"), {"idea_id": idea_id})
+                logger.info(f"Deleted {delete_result.rowcount} legacy conversation records for idea {idea_id}")
                 
         except Exception as cleanup_error:
             logger.error(f"Legacy cleanup failed: {cleanup_error}")
@@ -446,10 +567,11 @@ def delete_idea(
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to clean up legacy references: {str(cleanup_error)}")
         
-        # Perform the deletion
-        db.delete(idea)  # Cascading deletes will handle related records
+        # One DELETE; ON DELETE CASCADE removes the idea's sessions and plans in the database
+        db.query(Idea).filter(Idea.id == idea_id).delete(synchronize_session=False)
         db.commit()
         
+        _invalidate_recent_ideas()
         logger.info(f"✅ Successfully deleted idea: {idea_id}")
         return {"message": "Idea deleted successfully"}
         
@@ -467,7 +589,7 @@ def get_idea_summary(
     """
     Get a comprehensive summary of an idea's progress through the system
     """
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
+    idea = _get_idea_with_relations(db, idea_id)
     
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
@@ -490,7 +612,7 @@ def get_idea_summary(
         "refinement_progress": {
             "total_sessions": len(sessions),
             "completed_sessions": len([s for s in sessions if s.is_complete]),
-            "latest_session": sessions[0] if sessions else None
+            "latest_session": idea.latest_session
         },
         "planning_progress": {
             "total_plans": len(plans),
@@ -1,14 +1,17 @@
 """
 API routes for implementation plans - AI-generated plans based on refined ideas
 """
-from fastapi import APIRouter, Depends, HTTPException, Response
-from fastapi.responses import JSONResponse
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
+from datetime import datetime
 import json
+import orjson
 
-from database import get_db
+from database import SessionLocal, get_db
 from models import Idea, RefinementSession, Plan, IdeaStatus, PlanStatus
 from schemas import (
     PlanCreate,
@@ -27,31 +30,30 @@ ai_service = AIService()
 @router.get("/ideas/{idea_id}", response_model=List[PlanResponse])
 def get_idea_plans(
     idea_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[datetime] = Query(None),
     db: Session = Depends(get_db)
 ):
     """
-    Get all plans for a specific idea
+    Get plans for a specific idea, newest first
+    Pass the created_at of the last plan received as `before` to fetch the next page
     """
     # Verify idea exists
     idea = db.query(Idea).filter(Idea.id == idea_id).first()
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     
-    # Get plans for this idea, ordered by creation date (newest first)
-    plans = db.query(Plan).filter(
-        Plan.idea_id == idea_id
-    ).order_by(Plan.created_at.desc()).all()
+    # Get plans for this idea, ordered by creation date (newest first); keyset
+    # pagination on created_at walks the (idea_id, created_at) index
+    query = db.query(Plan).filter(Plan.idea_id == idea_id)
+    if before is not None:
+        query = query.filter(Plan.created_at < before)
+    plans = query.order_by(Plan.created_at.desc()).limit(limit).all()
     
     return plans
 
-@router.post("/generate/", response_model=PlanResponse)
-async def generate_plan(
-    request: Dict[str, Any],
-    db: Session = Depends(get_db)
-):
-    """
-    Generate an implementation plan from a completed refinement session
-    """
+def _get_completed_refinement_session(request: Dict[str, Any], db: Session) -> RefinementSession:
+    """Look up the completed refinement session named by a plan generation request"""
     # Extract refinement_session_id from request body
     refinement_session_id = request.get("refinement_session_id")
     if not refinement_session_id:
@@ -76,73 +78,158 @@ async def generate_plan(
             detail="Refinement session must be completed before generating plan"
         )
     
-    # Get the idea
+    return session
+
+def _load_plan_generation_inputs(request: Dict[str, Any], db: Session) -> Dict[str, Any]:
+    """Everything plan generation needs from the database, read in one sync unit of work"""
+    session = _get_completed_refinement_session(request, db)
     idea = session.idea
+    return {
+        "idea_id": idea.id,
+        "refinement_session_id": session.id,
+        "title": idea.title,
+        "description": idea.original_description,
+        "answers": session.answers
+    }
+
+def _save_generated_plan(
+    db: Session,
+    idea_id: UUID,
+    refinement_session_id: UUID,
+    plan_data: Dict[str, Any]
+) -> PlanResponse:
+    """Store a generated plan for an idea and mark the idea as planned"""
+    idea = db.get(Idea, idea_id)
+    
+    # Convert steps and resources to JSON format
+    steps_json = [
+        {
+            "order": step.order,
+            "title": step.title,
+            "description": step.description,
+            "estimated_time": step.estimated_time
+        }
+        for step in plan_data["steps"]
+    ]
+    
+    resources_json = [
+        {
+            "title": resource.title,
+            "url": resource.url,
+            "type": resource.type,
+            "description": resource.description
+        }
+        for resource in plan_data["resources"]
+    ]
+    
+    # Generate markdown content
+    markdown_content = ai_service.generate_markdown(
+        plan_data, 
+        idea.title
+    )
+    
+    # Create plan
+    plan = Plan(
+        idea_id=idea.id,
+        refinement_session_id=refinement_session_id,
+        summary=plan_data["summary"],
+        steps=steps_json,
+        resources=resources_json,
+        status=PlanStatus.generated,
+        content_markdown=markdown_content,
+        is_active=False  # Not active by default
+    )
+    
+    db.add(plan)
+    
+    # Update idea status to planned
+    idea.status = IdeaStatus.planned
+    
+    # Flushed so defaults are populated; the response is built before commit expires the plan
+    db.flush()
+    response = PlanResponse.model_validate(plan)
+    db.commit()
+    
+    return response
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON payload"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+@router.post("/generate/", response_model=PlanResponse)
+async def generate_plan(
+    request: Dict[str, Any],
+    db: Session = Depends(get_db)
+):
+    """
+    Generate an implementation plan from a completed refinement session
+    """
+    # Database work runs in worker threads; only the AI call is awaited on the event loop
+    inputs = await asyncio.to_thread(_load_plan_generation_inputs, request, db)
     
     try:
         # Generate plan using AI
         plan_data = await ai_service.generate_plan(
-            title=idea.title,
-            description=idea.original_description,
-            answers=session.answers
-        )
-        
-        # Convert steps and resources to JSON format
-        steps_json = [
-            {
-                "order": step.order,
-                "title": step.title,
-                "description": step.description,
-                "estimated_time": step.estimated_time
-            }
-            for step in plan_data["steps"]
-        ]
-        
-        resources_json = [
-            {
-                "title": resource.title,
-                "url": resource.url,
-                "type": resource.type,
-                "description": resource.description
-            }
-            for resource in plan_data["resources"]
-        ]
-        
-        # Generate markdown content
-        markdown_content = ai_service.generate_markdown(
-            plan_data, 
-            idea.title
+            title=inputs["title"],
+            description=inputs["description"],
+            answers=inputs["answers"],
+            idea_id=inputs["idea_id"]
         )
         
-        # Create plan
-        plan = Plan(
-            idea_id=idea.id,
-            refinement_session_id=refinement_session_id,
-            summary=plan_data["summary"],
-            steps=steps_json,
-            resources=resources_json,
-            status=PlanStatus.generated,
-            content_markdown=markdown_content,
-            is_active=False  # Not active by default
+        return await asyncio.to_thread(
+            _save_generated_plan, db, inputs["idea_id"], inputs["refinement_session_id"], plan_data
         )
         
-        db.add(plan)
-        
-        # Update idea status to planned
-        idea.status = IdeaStatus.planned
-        
-        db.commit()
-        db.refresh(plan)
-        
-        return plan
-        
     except Exception as e:
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate plan: {str(e)}"
         )
 
+@router.post("/generate/stream/")
+async def stream_plan_generation(
+    request: Dict[str, Any],
+    db: Session = Depends(get_db)
+):
+    """
+    Generate an implementation plan like /generate/, streamed as server-sent events.
+    Emits "summary" and "step" events as the LLM produces them, then a "plan"
+    event with the saved plan (or an "error" event if generation failed after
+    previews were sent, or the plan could not be saved).
+    """
+    inputs = await asyncio.to_thread(_load_plan_generation_inputs, request, db)
+    
+    async def events():
+        # The request-scoped session may already be closed while the body streams,
+        # so the save uses a session owned by the generator
+        stream_db = SessionLocal()
+        try:
+            async for item in ai_service.generate_plan_stream(
+                title=inputs["title"],
+                description=inputs["description"],
+                answers=inputs["answers"]
+            ):
+                if item["event"] == "summary":
+                    yield _sse_event("summary", item["data"])
+                elif item["event"] == "step":
+                    yield _sse_event("step", item["data"].model_dump())
+                elif item["event"] == "error":
+                    yield _sse_event("error", item["data"])
+                else:
+                    try:
+                        plan = await asyncio.to_thread(
+                            _save_generated_plan, stream_db, inputs["idea_id"], inputs["refinement_session_id"], item["data"]
+                        )
+                        yield _sse_event("plan", plan.model_dump())
+                    except Exception as e:
+                        await asyncio.to_thread(stream_db.rollback)
+                        yield _sse_event("error", {"detail": f"Failed to generate plan: {str(e)}"})
+        finally:
+            await asyncio.to_thread(stream_db.close)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @router.post("/upload/", response_model=PlanResponse)
 def upload_plan(
     plan_upload: PlanUpload,
@@ -183,26 +270,30 @@ def upload_plan(
         ]
         
         # Generate markdown content from the original upload
-        markdown_content = f"# {plan_upload.title or idea.title} - Implementation Plan\n\n"
-        markdown_content += f"## Summary\n{parsed_plan['summary']}\n\n"
-        markdown_content += "## Steps\n\n"
+        parts = [
+            f"# {plan_upload.title or idea.title} - Implementation Plan\n\n",
+            f"## Summary\n{parsed_plan['summary']}\n\n",
+            "## Steps\n\n"
+        ]
         
         for step in parsed_plan["steps"]:
-            markdown_content += f"### {step.order}. {step.title}\n"
-            markdown_content += f"{step.description}\n"
+            parts.append(f"### {step.order}. {step.title}\n")
+            parts.append(f"{step.description}\n")
             if step.estimated_time:
-                markdown_content += f"**Estimated Time:** {step.estimated_time}\n"
-            markdown_content += "\n"
+                parts.append(f"**Estimated Time:** {step.estimated_time}\n")
+            parts.append("\n")
         
         if parsed_plan["resources"]:
-            markdown_content += "## Resources\n\n"
+            parts.append("## Resources\n\n")
             for resource in parsed_plan["resources"]:
-                markdown_content += f"- **{resource.title}**"
+                parts.append(f"- **{resource.title}**")
                 if resource.url:
-                    markdown_content += f" ([Link]({resource.url}))"
+                    parts.append(f" ([Link]({resource.url}))")
                 if resource.description:
-                    markdown_content += f" - {resource.description}"
-                markdown_content += "\n"
+                    parts.append(f" - {resource.description}")
+                parts.append("\n")
+        
+        markdown_content = "".join(parts)
         
         # Create plan
         plan = Plan(
@@ -222,10 +313,12 @@ def upload_plan(
         if idea.status != IdeaStatus.planned:
             idea.status = IdeaStatus.planned
         
+        # Flushed so defaults are populated; the response is built before commit expires the session
+        db.flush()
+        response = PlanResponse.model_validate(plan)
         db.commit()
-        db.refresh(plan)
         
-        return plan
+        return response
         
     except Exception as e:
         db.rollback()
@@ -309,10 +402,12 @@ def update_plan(
             plan.idea.title
         )
     
+    # Built before commit, which expires the loaded plan
+    db.flush()
+    response = PlanResponse.model_validate(plan)
     db.commit()
-    db.refresh(plan)
     
-    return plan
+    return response
 
 @router.post("/{plan_id}/activate", response_model=PlanResponse)
 def activate_plan(
@@ -328,12 +423,13 @@ def activate_plan(
         raise HTTPException(status_code=404, detail="Plan not found")
     
     # Use the model method to activate (deactivates others)
-    plan.activate()
+    plan.activate(db)
     
+    # Built before commit, which expires the loaded plan
+    response = PlanResponse.model_validate(plan)
     db.commit()
-    db.refresh(plan)
     
-    return plan
+    return response
 
 @router.delete("/{plan_id}")
 def delete_plan(
@@ -361,17 +457,15 @@ def export_plan_json(
     """
     Export plan as JSON
     """
-    plan = db.query(Plan).filter(Plan.id == plan_id).first()
+    export_data = Plan.export_query(db, plan_id)
     
-    if not plan:
+    if export_data is None:
         raise HTTPException(status_code=404, detail="Plan not found")
     
-    export_data = plan.to_export_dict()
-    
-    return JSONResponse(
+    return ORJSONResponse(
         content=export_data,
         headers={
-            "Content-Disposition": f"attachment; filename={plan.idea.title.replace(' ', '_')}_plan.json"
+            "Content-Disposition": f"attachment; filename={export_data['idea']['title'].replace(' ', '_')}_plan.json"
         }
     )
 
@@ -402,6 +496,13 @@ def export_plan_markdown(
         }
     )
 
+def _get_idea_text(db: Session, idea_id: UUID):
+    """Load just the title and description of an idea, or 404"""
+    idea = db.query(Idea.title, Idea.original_description).filter(Idea.id == idea_id).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return idea
+
 @router.post("/test-generation/", response_model=PlanGenerationResponse)
 async def test_plan_generation(
     request: Dict[str, Any],
@@ -422,15 +523,14 @@ async def test_plan_generation(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid idea_id format")
     
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
-    if not idea:
-        raise HTTPException(status_code=404, detail="Idea not found")
+    idea = await asyncio.to_thread(_get_idea_text, db, idea_id)
     
     try:
         plan_data = await ai_service.generate_plan(
             title=idea.title,
             description=idea.original_description,
-            answers=answers
+            answers=answers,
+            idea_id=idea_id
         )
         
         return PlanGenerationResponse(
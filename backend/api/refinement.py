@@ -1,17 +1,20 @@
 """
 API routes for refinement sessions - AI-generated questions and answers
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
+from datetime import datetime
 
 from database import get_db
-from models import Idea, RefinementSession, IdeaStatus
+from models import Idea, RefinementSession, Plan, IdeaStatus, PlanStatus
 from schemas import (
     RefinementSessionCreate,
     RefinementSessionResponse,
     RefinementAnswersSubmit,
+    RefinementQuestion,
     QuestionGenerationResponse
 )
 from services.ai_service import AIService
@@ -19,6 +22,71 @@ from services.ai_service import AIService
 router = APIRouter(prefix="/refinement", tags=["refinement"])
 ai_service = AIService()
 
+def _load_refinement_context(db: Session, idea_id: UUID) -> Tuple[Idea, List[RefinementSession], List[Plan]]:
+    """Load an idea with its completed sessions and active plan, or 404"""
+    idea = db.query(Idea).options(
+        selectinload(Idea.refinement_sessions),
+        selectinload(Idea.plans)
+    ).filter(Idea.id == idea_id).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    
+    # Get previous context for continuation (sessions are loaded newest first)
+    previous_sessions = [session for session in idea.refinement_sessions if session.is_complete]
+    
+    previous_plans = []
+    active_plan = idea.active_plan
+    if active_plan:
+        previous_plans = [active_plan]
+    
+    return idea, previous_sessions, previous_plans
+
+def _save_refinement_session(
+    db: Session,
+    idea: Idea,
+    questions: List[RefinementQuestion],
+    tentative_plan: Optional[Dict[str, Any]]
+) -> RefinementSessionResponse:
+    """Store a new refinement session (and any tentative draft plan) and mark the idea as refining"""
+    # Convert to JSON format for storage
+    questions_json = [
+        {"id": q.id, "question": q.question} 
+        for q in questions
+    ]
+    
+    # Create refinement session
+    refinement_session = RefinementSession(
+        idea_id=idea.id,
+        questions=questions_json,
+        answers={},
+        is_complete=False
+    )
+    
+    db.add(refinement_session)
+    
+    # Store the tentative plan as an inactive draft until refinement produces a real one
+    if tentative_plan:
+        db.add(Plan(
+            idea_id=idea.id,
+            refinement_session=refinement_session,
+            summary=tentative_plan["summary"],
+            steps=[step.model_dump() for step in tentative_plan["steps"]],
+            resources=[resource.model_dump() for resource in tentative_plan["resources"]],
+            status=PlanStatus.draft,
+            content_markdown=ai_service.generate_markdown(tentative_plan, idea.title),
+            is_active=False
+        ))
+    
+    # Update idea status to refining
+    idea.status = IdeaStatus.refining
+    
+    # Flushed so defaults are populated; the response is built before commit expires the session
+    db.flush()
+    response = RefinementSessionResponse.model_validate(refinement_session)
+    db.commit()
+    
+    return response
+
 @router.post("/sessions/", response_model=RefinementSessionResponse)
 async def create_refinement_session(
     session_data: RefinementSessionCreate,
@@ -27,56 +95,34 @@ async def create_refinement_session(
     """
     Create a new refinement session with AI-generated questions
     """
-    # Get the idea
-    idea = db.query(Idea).filter(Idea.id == session_data.idea_id).first()
-    if not idea:
-        raise HTTPException(status_code=404, detail="Idea not found")
-    
-    # Get previous context for continuation
-    previous_sessions = db.query(RefinementSession).filter(
-        RefinementSession.idea_id == session_data.idea_id,
-        RefinementSession.is_complete == True
-    ).order_by(RefinementSession.created_at.desc()).all()
-    
-    previous_plans = []
-    if idea.active_plan:
-        previous_plans = [idea.active_plan]
+    # Database work runs in worker threads; only the AI calls are awaited on the event loop
+    idea, previous_sessions, previous_plans = await asyncio.to_thread(
+        _load_refinement_context, db, session_data.idea_id
+    )
     
     # Generate questions using AI with context
     try:
-        questions = await ai_service.generate_refinement_questions(
-            title=idea.title,
-            description=idea.original_description,
-            previous_sessions=previous_sessions,
-            previous_plans=previous_plans
-        )
-        
-        # Convert to JSON format for storage
-        questions_json = [
-            {"id": q.id, "question": q.question} 
-            for q in questions
-        ]
-        
-        # Create refinement session
-        refinement_session = RefinementSession(
-            idea_id=session_data.idea_id,
-            questions=questions_json,
-            answers={},
-            is_complete=False
-        )
-        
-        db.add(refinement_session)
-        
-        # Update idea status to refining
-        idea.status = IdeaStatus.refining
+        tentative_plan = None
+        if previous_sessions or previous_plans:
+            questions = await ai_service.generate_refinement_questions(
+                title=idea.title,
+                description=idea.original_description,
+                previous_sessions=previous_sessions,
+                previous_plans=previous_plans
+            )
+        else:
+            # First session: with tentative_plan_enabled, a detailed description also yields a tentative plan from the same call
+            generated = await ai_service.generate_questions_and_tentative_plan(
+                title=idea.title,
+                description=idea.original_description
+            )
+            questions = generated["questions"]
+            tentative_plan = generated["tentative_plan"]
         
-        db.commit()
-        db.refresh(refinement_session)
-        
-        return refinement_session
+        return await asyncio.to_thread(_save_refinement_session, db, idea, questions, tentative_plan)
         
     except Exception as e:
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to create refinement session: {str(e)}"
@@ -102,18 +148,23 @@ def get_refinement_session(
 @router.get("/ideas/{idea_id}/sessions/", response_model=List[RefinementSessionResponse])
 def get_idea_refinement_sessions(
     idea_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[datetime] = Query(None),
     db: Session = Depends(get_db)
 ):
     """
-    Get all refinement sessions for an idea
+    Get refinement sessions for an idea, newest first
+    Pass the created_at of the last session received as `before` to fetch the next page
     """
     idea = db.query(Idea).filter(Idea.id == idea_id).first()
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     
-    sessions = db.query(RefinementSession).filter(
-        RefinementSession.idea_id == idea_id
-    ).order_by(RefinementSession.created_at.desc()).all()
+    # Keyset pagination on created_at walks the (idea_id, created_at) index
+    query = db.query(RefinementSession).filter(RefinementSession.idea_id == idea_id)
+    if before is not None:
+        query = query.filter(RefinementSession.created_at < before)
+    sessions = query.order_by(RefinementSession.created_at.desc()).limit(limit).all()
     
     return sessions
 
@@ -143,10 +194,12 @@ def submit_refinement_answers(
     if question_ids <= answered_ids:  # All questions answered
         session.mark_complete()
     
+    # Built before commit, which expires the loaded session
+    db.flush()
+    response = RefinementSessionResponse.model_validate(session)
     db.commit()
-    db.refresh(session)
     
-    return session
+    return response
 
 @router.post("/sessions/{session_id}/complete/", response_model=RefinementSessionResponse)
 def complete_refinement_session(
@@ -164,10 +217,19 @@ def complete_refinement_session(
         raise HTTPException(status_code=404, detail="Refinement session not found")
     
     session.mark_complete()
+    # Built before commit, which expires the loaded session
+    db.flush()
+    response = RefinementSessionResponse.model_validate(session)
     db.commit()
-    db.refresh(session)
     
-    return session
+    return response
+
+def _get_idea_text(db: Session, idea_id: UUID):
+    """Load just the title and description of an idea, or 404"""
+    idea = db.query(Idea.title, Idea.original_description).filter(Idea.id == idea_id).first()
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+    return idea
 
 @router.post("/questions/generate/", response_model=QuestionGenerationResponse)
 async def generate_questions(
@@ -187,9 +249,7 @@ async def generate_questions(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid idea_id format")
     
-    idea = db.query(Idea).filter(Idea.id == idea_id).first()
-    if not idea:
-        raise HTTPException(status_code=404, detail="Idea not found")
+    idea = await asyncio.to_thread(_get_idea_text, db, idea_id)
     
     try:
         questions = await ai_service.generate_refinement_questions(
@@ -15,7 +15,7 @@ from schemas import TodoCreate, TodoUpdate, TodoResponse
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 @router.get("/", response_model=List[TodoResponse])
-async def get_todos(
+def get_todos(
     completed: bool = None,
     db: Session = Depends(get_db)
 ):
@@ -29,19 +29,21 @@ async def get_todos(
     return todos
 
 @router.post("/", response_model=TodoResponse, status_code=201)
-async def create_todo(
+def create_todo(
     todo_data: TodoCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new todo"""
     todo = Todo(text=todo_data.text)
     db.add(todo)
+    # Flushed so defaults are populated; the response is built before commit expires the session
+    db.flush()
+    response = TodoResponse.model_validate(todo)
     db.commit()
-    db.refresh(todo)
-    return todo
+    return response
 
 @router.get("/{todo_id}", response_model=TodoResponse)
-async def get_todo(
+def get_todo(
     todo_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -52,7 +54,7 @@ async def get_todo(
     return todo
 
 @router.put("/{todo_id}", response_model=TodoResponse)
-async def update_todo(
+def update_todo(
     todo_id: UUID,
     todo_data: TodoUpdate,
     db: Session = Depends(get_db)
@@ -67,12 +69,14 @@ async def update_todo(
     if todo_data.is_completed is not None:
         todo.is_completed = todo_data.is_completed
     
+    # Built before commit, which expires the loaded todo
+    db.flush()
+    response = TodoResponse.model_validate(todo)
     db.commit()
-    db.refresh(todo)
-    return todo
+    return response
 
 @router.post("/{todo_id}/complete", response_model=TodoResponse)
-async def complete_todo(
+def complete_todo(
     todo_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -81,15 +85,18 @@ async def complete_todo(
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     
-    # Mark as completed with timestamp for undo functionality
+    # Mark as completed with timestamp for undo functionality (client-side UTC, the
+    # same clock undo compares against, so the value is known without reloading it)
     todo.is_completed = True
-    todo.completed_at = func.now()
+    todo.completed_at = datetime.utcnow()
+    # Built before commit, which expires the loaded todo
+    db.flush()
+    response = TodoResponse.model_validate(todo)
     db.commit()
-    db.refresh(todo)
-    return todo
+    return response
 
 @router.delete("/{todo_id}")
-async def delete_todo(
+def delete_todo(
     todo_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -103,7 +110,7 @@ async def delete_todo(
     return {"message": "Todo deleted"}
 
 @router.post("/{todo_id}/undo-complete", response_model=TodoResponse)
-async def undo_complete_todo(
+def undo_complete_todo(
     todo_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -124,12 +131,14 @@ async def undo_complete_todo(
     # Undo the completion
     todo.is_completed = False
     todo.completed_at = None
+    # Built before commit, which expires the loaded todo
+    db.flush()
+    response = TodoResponse.model_validate(todo)
     db.commit()
-    db.refresh(todo)
-    return todo
+    return response
 
 @router.get("/stats/count")
-async def get_todo_stats(db: Session = Depends(get_db)):
+def get_todo_stats(db: Session = Depends(get_db)):
     """Get todo statistics"""
     total = db.query(func.count(Todo.id)).scalar()
     completed = db.query(func.count(Todo.id)).filter(Todo.is_completed == True).scalar()
@@ -0,0 +1,113 @@
+"""
+Batch plan generation for many ideas, checkpointed so an interrupted run can resume
+Each finished idea is appended to a JSONL checkpoint as {"idea_id": ..., "plan": {...}};
+rerunning with the same checkpoint skips ideas already in it.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import orjson
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+from config import settings
+from database import SessionLocal
+from models import Idea, RefinementSession
+from services.ai_service import AIService, close_openai_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Retry with exponential backoff: 1s, 2s, 4s, ... capped at MAX_BACKOFF seconds
+MAX_ATTEMPTS = 5
+MAX_BACKOFF = 60
+
+
+def load_pending_ideas(idea_ids: Optional[List[UUID]] = None) -> List[Dict[str, Any]]:
+    """Load each idea with the answers from its latest completed refinement session"""
+    with SessionLocal() as db:
+        query = db.query(
+            Idea.id, Idea.title, Idea.original_description, RefinementSession.answers
+        ).join(
+            RefinementSession, RefinementSession.idea_id == Idea.id
+        ).filter(
+            RefinementSession.is_complete == True
+        )
+        if idea_ids:
+            query = query.filter(Idea.id.in_(idea_ids))
+        rows = query.distinct(Idea.id).order_by(Idea.id, RefinementSession.created_at.desc()).all()
+
+    return [
+        {"idea_id": row.id, "title": row.title, "description": row.original_description, "answers": row.answers}
+        for row in rows
+    ]
+
+
+def load_checkpoint(checkpoint_path: str) -> Set[UUID]:
+    """Return the ids of ideas already recorded in the checkpoint file"""
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, "rb") as f:
+        return {UUID(orjson.loads(line)["idea_id"]) for line in f if line.strip()}
+
+
+async def generate_plans_checkpointed(
+    idea_ids: Optional[List[UUID]],
+    checkpoint_path: str,
+    concurrency: int = settings.openai_concurrency
+) -> int:
+    """
+    Generate plans for every pending idea not yet in the checkpoint
+    Returns the number of ideas that still failed after all retries
+    """
+    ideas = await asyncio.to_thread(load_pending_ideas, idea_ids)
+    done = load_checkpoint(checkpoint_path)
+    pending = [idea for idea in ideas if idea["idea_id"] not in done]
+    logger.info(f"{len(ideas)} ideas with completed refinement, {len(done)} already checkpointed, {len(pending)} to generate")
+
+    ai_service = AIService()
+    slots = asyncio.Semaphore(concurrency)
+    write_lock = asyncio.Lock()
+    failed = 0
+
+    with open(checkpoint_path, "ab") as checkpoint:
+        async def generate_one(idea: Dict[str, Any]):
+            nonlocal failed
+            async with slots:
+                for attempt in range(MAX_ATTEMPTS):
+                    try:
+                        plan = await ai_service.generate_plan_or_raise(
+                            idea["title"], idea["description"], idea["answers"],
+                            idea_id=idea["idea_id"], use_cache=True
+                        )
+                        break
+                    except Exception as e:
+                        if attempt == MAX_ATTEMPTS - 1:
+                            logger.error(f"Giving up on idea {idea['idea_id']} after {MAX_ATTEMPTS} attempts: {e}")
+                            failed += 1
+                            return
+                        delay = min(MAX_BACKOFF, 2 ** attempt)
+                        logger.warning(f"Plan generation failed for idea {idea['idea_id']}, retrying in {delay}s: {e}")
+                        await asyncio.sleep(delay)
+
+            # One complete line per idea, flushed immediately so a crash loses at most in-flight work
+            async with write_lock:
+                checkpoint.write(orjson.dumps({"idea_id": idea["idea_id"], "plan": plan.model_dump()}) + b"\n")
+                checkpoint.flush()
+
+        await asyncio.gather(*(generate_one(idea) for idea in pending))
+
+    await close_openai_client()
+    logger.info(f"Batch finished: {len(pending) - failed} generated, {failed} failed")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate plans for many ideas with a resumable JSONL checkpoint")
+    parser.add_argument("checkpoint", help="JSONL checkpoint file (created if missing, appended to otherwise)")
+    parser.add_argument("--idea-id", action="append", type=UUID, dest="idea_ids", help="Only these ideas (repeatable); default is every refined idea")
+    parser.add_argument("--concurrency", type=int, default=settings.openai_concurrency, help="Ideas generated at once")
+    args = parser.parse_args()
+
+    failures = asyncio.run(generate_plans_checkpointed(args.idea_ids, args.checkpoint, args.concurrency))
+    raise SystemExit(1 if failures else 0)
@@ -15,7 +15,17 @@ class Settings(BaseSettings):
     # OpenAI settings
     openai_api_key: str
     openai_model: str = "gpt-4o"
+    openai_model_small: str = "gpt-4o-mini"  # Cheaper, faster model for structurally simple tasks (questions)
     openai_timeout: float = 30.0  # Timeout in seconds for OpenAI API calls
+    openai_concurrency: int = 5  # Maximum in-flight OpenAI requests per process
+    llm_cache_enabled: bool = True  # Reuse stored completions for identical requests
+    llm_cache_ttl: int = 7 * 24 * 3600  # Seconds a cached completion stays valid
+    semantic_cache_enabled: bool = False  # Reuse plans for near-duplicate ideas (requires pgvector)
+    semantic_cache_threshold: float = 0.97  # Minimum cosine similarity for a semantic cache hit; high because hits are served verbatim across ideas
+    openai_embedding_model: str = "text-embedding-3-small"
+    openai_embedding_dimensions: int = 1536
+    # Draft a plan alongside the first questions for detailed ideas (uses the large model and stores a draft plan)
+    tentative_plan_enabled: bool = False
     
     # Application settings
     environment: str = "development"  
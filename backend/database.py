@@ -12,6 +12,9 @@ from models import Base, Idea, RefinementSession, Plan, Todo
 # Create database engine
 engine = create_engine(
     settings.database_url,
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
     pool_pre_ping=True,
     pool_recycle=300,
 )
@@ -53,17 +56,11 @@ def reset_database():
 # Database health check
 def check_database_connection():
     """Check if database connection is working."""
-    db = None
     try:
-        from sqlalchemy import text
-        db = SessionLocal()
-        # Simple query to test connection
-        db.execute(text("SELECT 1"))
+        # A bare connection checkout skips the ORM session setup/teardown
+        with engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
         return True
     except Exception as e:
         print(f"Database connection failed: {e}")
         return False
-    finally:
-        # Ensure connection is always closed, even if query fails
-        if db is not None:
-            db.close()
\ No newline at end of file
@@ -21,6 +21,11 @@ def backup_existing_ideas():
             logger.info("No existing ideas table found, no backup needed")
             return []
         
+        # Skip the full SELECT when the table is empty
+        if db.execute(text("SELECT 1 FROM ideas LIMIT 1")).first() is None:
+            logger.info("Ideas table is empty, no backup needed")
+            return []
+        
         # Get existing ideas
         result = db.execute(text("SELECT * FROM ideas"))
         ideas = result.fetchall()
@@ -44,18 +49,23 @@ def clean_orphaned_tables():
         # Define orphaned tables from old architecture in dependency order
         # Drop dependent tables first to avoid constraint violations
         orphaned_tables = ['exports', 'conversations', 'build_plans']
+        tables_to_drop = []
         
         for table in orphaned_tables:
             if table in existing_tables:
                 logger.info(f"Dropping orphaned table: {table}")
-                db.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+                tables_to_drop.append(table)
         
         # Also drop any other tables that might exist but aren't in our current model
         current_model_tables = {'ideas', 'refinement_sessions', 'plans'}
         for table in existing_tables:
-            if table not in current_model_tables and not table.startswith('alembic'):
+            if table not in current_model_tables and table not in tables_to_drop and not table.startswith('alembic'):
                 logger.info(f"Dropping unknown table: {table}")
-                db.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+                tables_to_drop.append(table)
+        
+        # PostgreSQL drops several tables in one statement, so this is a single round-trip
+        if tables_to_drop:
+            db.execute(text(f"DROP TABLE IF EXISTS {', '.join(tables_to_drop)} CASCADE"))
         
         db.commit()
         logger.info("✅ Orphaned tables cleaned up")
@@ -81,9 +91,7 @@ def drop_and_recreate_tables():
         db = SessionLocal()
         try:
             # Drop tables that we know exist in our current model
-            tables_to_drop = ['plans', 'refinement_sessions', 'ideas']
-            for table in tables_to_drop:
-                db.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+            db.execute(text("DROP TABLE IF EXISTS plans, refinement_sessions, ideas CASCADE"))
             db.commit()
             logger.info("✅ Tables dropped with CASCADE")
         except Exception as e:
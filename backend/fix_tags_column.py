@@ -26,18 +26,13 @@ def fix_tags_column():
             if column_info.data_type.upper() == 'ARRAY':
                 logger.info("✅ Tags column is already ARRAY type - no conversion needed!")
                 
-                # Just verify we can read the data
+                # Just verify we can read the data - a sample is enough, no need to scan the whole table
                 try:
-                    result = db.execute(text("SELECT COUNT(*) FROM ideas"))
-                    count = result.scalar()
-                    logger.info(f"Found {count} existing ideas")
-                    
-                    # Get sample data to see current format
-                    if count > 0:
-                        result = db.execute(text("SELECT id, title, tags FROM ideas LIMIT 3"))
-                        samples = result.fetchall()
-                        for sample in samples:
-                            logger.info(f"Sample idea: {sample.title} - tags: {sample.tags} (type: {type(sample.tags)})")
+                    result = db.execute(text("SELECT id, title, tags FROM ideas LIMIT 3"))
+                    samples = result.fetchall()
+                    logger.info(f"Read {len(samples)} sample ideas")
+                    for sample in samples:
+                        logger.info(f"Sample idea: {sample.title} - tags: {sample.tags} (type: {type(sample.tags)})")
                     
                     # Column is already correct type, just commit and return
                     db.commit()
@@ -55,9 +50,8 @@ def fix_tags_column():
         
         # Check if ideas table exists
         try:
-            result = db.execute(text("SELECT COUNT(*) FROM ideas"))
-            count = result.scalar()
-            logger.info(f"Found {count} existing ideas")
+            db.execute(text("SELECT 1 FROM ideas LIMIT 1"))
+            logger.info("Found existing ideas table")
         except Exception as e:
             logger.info(f"Ideas table doesn't exist: {e}")
             # Let SQLAlchemy create the tables normally
@@ -3,10 +3,14 @@ FastAPI main application for Bright Ideas backend - New Architecture
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
+import contextlib
 import logging
 import os
+import orjson
+from datetime import datetime
 from config import settings
 from database import create_tables
 
@@ -17,6 +21,38 @@ from api import ideas, refinement, plans, todos
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cached database health, refreshed in the background so health probes never hit the DB
+DB_HEALTH_POLL_INTERVAL = 30  # seconds
+db_health = {"database": "unknown", "checked_at": None}
+
+
+async def poll_database_health():
+    """Refresh the cached database health status periodically."""
+    from database import check_database_connection
+    while True:
+        connected = await asyncio.to_thread(check_database_connection)
+        db_health["database"] = "connected" if connected else "unavailable"
+        db_health["checked_at"] = datetime.utcnow().isoformat()
+        await asyncio.sleep(DB_HEALTH_POLL_INTERVAL)
+
+
+# Expired cache rows are only skipped on read, so delete them in the background
+CACHE_PURGE_INTERVAL = 3600  # seconds
+
+
+async def purge_expired_caches():
+    """Delete expired LLM and semantic plan cache entries periodically."""
+    from services import llm_cache, semantic_cache
+    while True:
+        deleted = await asyncio.to_thread(llm_cache.purge_expired_completions)
+        if deleted:
+            logger.info(f"Purged {deleted} expired LLM cache entries")
+        if settings.semantic_cache_enabled:
+            deleted = await asyncio.to_thread(semantic_cache.purge_expired_plans)
+            if deleted:
+                logger.info(f"Purged {deleted} expired semantic plan cache entries")
+        await asyncio.sleep(CACHE_PURGE_INTERVAL)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -24,28 +60,36 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Bright Ideas API (New Architecture v2.1)...")
     
+    logger.info("Attempting to create/fix database tables...")
+    
+    # Check the database connection and run the targeted tags column fix
+    # for PostgreSQL compatibility concurrently. Both use blocking psycopg2
+    # calls, so run them in worker threads to keep the event loop free.
+    # The tags fix only inspects the column, so overlapping the check is harmless
+    from database import check_database_connection
+    from fix_tags_column import fix_tags_column
+    connection_ok, tags_fixed = await asyncio.gather(
+        asyncio.to_thread(check_database_connection),
+        asyncio.to_thread(fix_tags_column),
+    )
+    if not connection_ok:
+        # Skip table creation and migrations (and their fallback): none can succeed
+        logger.error("❌ Database connection failed, cannot proceed with migrations")
+        logger.error(f"Database URL configured: {bool(os.environ.get('DATABASE_URL'))}")
+        raise RuntimeError("Database connection unavailable")
+    
     # Create database tables with JSON schema fix
     try:
-        logger.info("Attempting to create/fix database tables...")
-        
-        # First check database connection
-        from database import check_database_connection
-        if not check_database_connection():
-            logger.error("❌ Database connection failed, cannot proceed with migrations")
-            raise Exception("Database connection unavailable")
-        
-        # Run targeted tags column fix for PostgreSQL compatibility
-        from fix_tags_column import fix_tags_column
-        if not fix_tags_column():
+        if not tags_fixed:
             logger.warning("Tags column fix failed, but continuing with startup...")
         
-        # Also ensure all tables exist
-        create_tables()
+        # Also ensure all tables exist (must run after the tags column fix)
+        await asyncio.to_thread(create_tables)
         
         # Apply manual migrations for new fields
         try:
             from manual_migration import apply_manual_migrations
-            apply_manual_migrations()
+            await asyncio.to_thread(apply_manual_migrations)
             logger.info("✅ Manual migrations applied successfully")
         except Exception as migration_error:
             logger.warning(f"Manual migration failed, continuing: {migration_error}")
@@ -58,7 +102,7 @@ async def lifespan(app: FastAPI):
         logger.error("❌ Migration script failed, attempting safe fallback...")
         try:
             logger.info("Attempting fallback table creation...")
-            create_tables()
+            await asyncio.to_thread(create_tables)
             logger.info("✅ Fallback table creation successful")
             logger.info("⚠️  Note: Migration failed but app started with existing/new schema")
         except Exception as fallback_error:
@@ -71,7 +115,7 @@ async def lifespan(app: FastAPI):
         # Fallback to regular table creation
         try:
             logger.info("Attempting fallback table creation...")
-            create_tables()
+            await asyncio.to_thread(create_tables)
             logger.info("✅ Fallback table creation successful")
             logger.info("⚠️  Note: JSON schema fix failed but app started with existing schema")
         except Exception as fallback_error:
@@ -79,10 +123,26 @@ async def lifespan(app: FastAPI):
             logger.error("💥 Cannot start app without database tables")
             raise
     
+    # Establish the shared OpenAI connection now so the first user request skips the handshake
+    from services.ai_service import warm_openai_client
+    await warm_openai_client()
+    
+    background_tasks = [
+        asyncio.create_task(poll_database_health()),
+        asyncio.create_task(purge_expired_caches()),
+    ]
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Bright Ideas API...")
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    from services.ai_service import close_openai_client
+    await close_openai_client()
 
 
 # Create FastAPI application
@@ -92,6 +152,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -110,7 +171,7 @@ app.add_middleware(
 @app.exception_handler(ValueError)
 async def value_error_handler(request, exc):
     """Handle ValueError exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"detail": str(exc)}
     )
@@ -119,7 +180,7 @@ async def value_error_handler(request, exc):
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     """Handle 404 errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={"detail": "Resource not found"}
     )
@@ -129,29 +190,47 @@ async def not_found_handler(request, exc):
 async def internal_error_handler(request, exc):
     """Handle 500 errors."""
     logger.error(f"Internal server error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
 
+# Static response bodies, serialized once at import since settings don't change at runtime
+HEALTH_RESPONSE = orjson.dumps({
+    "status": "healthy",
+    "version": "2.0.0",
+    "architecture": "structured_refinement",
+    "environment": settings.environment,
+    "cors_origins": settings.cors_origins,
+    "features": [
+        "ai_question_generation",
+        "structured_refinement",
+        "plan_generation",
+        "plan_export"
+    ]
+})
+
+ROOT_RESPONSE = orjson.dumps({
+    "message": "Welcome to Bright Ideas API - Structured Refinement System",
+    "version": "2.0.0",
+    "architecture": "AI-powered idea refinement with structured planning",
+    "docs": "/docs" if settings.debug else "Contact admin for API documentation",
+    "workflow": {
+        "1": "Capture idea (/ideas/)",
+        "2": "Start refinement session (/refinement/sessions/)", 
+        "3": "Answer AI-generated questions (/refinement/sessions/{id}/answers/)",
+        "4": "Generate implementation plan (/plans/generate/)",
+        "5": "Export plan (/plans/{id}/export/json or /plans/{id}/export/markdown)"
+    }
+})
+
+
 # Health check endpoints (both with and without API prefix)
 @app.get("/health")
 async def health_check():
     """API health check endpoint."""
-    return {
-        "status": "healthy",
-        "version": "2.0.0",
-        "architecture": "structured_refinement",
-        "environment": settings.environment,
-        "cors_origins": settings.cors_origins,
-        "features": [
-            "ai_question_generation",
-            "structured_refinement",
-            "plan_generation",
-            "plan_export"
-        ]
-    }
+    return Response(content=HEALTH_RESPONSE, media_type="application/json")
 
 @app.get(f"{settings.api_prefix}/health")
 async def health_check_api():
@@ -159,23 +238,17 @@ async def health_check_api():
     return await health_check()
 
 
+@app.get("/health/db")
+async def database_health_check():
+    """Database health check endpoint (served from the cached background poll)."""
+    return db_health
+
+
 # Root endpoint
 @app.get("/")
 async def root():
     """API root endpoint."""
-    return {
-        "message": "Welcome to Bright Ideas API - Structured Refinement System",
-        "version": "2.0.0",
-        "architecture": "AI-powered idea refinement with structured planning",
-        "docs": "/docs" if settings.debug else "Contact admin for API documentation",
-        "workflow": {
-            "1": "Capture idea (/ideas/)",
-            "2": "Start refinement session (/refinement/sessions/)", 
-            "3": "Answer AI-generated questions (/refinement/sessions/{id}/answers/)",
-            "4": "Generate implementation plan (/plans/generate/)",
-            "5": "Export plan (/plans/{id}/export/json or /plans/{id}/export/markdown)"
-        }
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
 
 
 # Include API routers
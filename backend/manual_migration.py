@@ -1,62 +1,178 @@
 """
 Manual migration script to handle database schema updates
 """
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy import text
 import logging
 from config import settings
+from database import engine
+from models import IDEA_SEARCH_VECTOR_SQL
 
 logger = logging.getLogger(__name__)
 
+# Arbitrary advisory lock key so only one worker runs the migration DDL at a time
+MIGRATION_LOCK_KEY = 727262
+
 def apply_manual_migrations():
     """Apply manual migrations for schema updates"""
-    engine = create_engine(settings.database_url)
-    
+    # Only the DDL the app can't run without shares this transaction; slow or optional
+    # steps below each run in their own, so a failure there leaves these in place
     with engine.begin() as conn:  # Use begin() for transaction management
         try:
-            # ALWAYS try to add is_unrefined column - PostgreSQL will error if it exists
-            # This ensures production database gets the column
-            try:
-                conn.execute(text("ALTER TABLE ideas ADD COLUMN IF NOT EXISTS is_unrefined BOOLEAN DEFAULT FALSE"))
-                logger.info("Successfully ensured is_unrefined column exists")
-            except Exception as e:
-                # Fallback for older PostgreSQL versions that don't support IF NOT EXISTS
-                try:
-                    result = conn.execute(text("SELECT is_unrefined FROM ideas LIMIT 1"))
-                    logger.info("is_unrefined column already exists")
-                except (OperationalError, ProgrammingError):
-                    logger.info("Adding is_unrefined column to ideas table")
-                    try:
-                        conn.execute(text("ALTER TABLE ideas ADD COLUMN is_unrefined BOOLEAN DEFAULT FALSE"))
-                        logger.info("Successfully added is_unrefined column")
-                    except Exception as alter_error:
-                        logger.error(f"Failed to add is_unrefined column: {alter_error}")
-                
-            # Check if todos table exists, if not create it
-            try:
-                conn.execute(text("SELECT COUNT(*) FROM todos"))
-                logger.info("todos table already exists")
-            except (OperationalError, ProgrammingError) as e:
-                logger.info(f"Creating todos table (error: {e})")
-                try:
-                    conn.execute(text("""
-                        CREATE TABLE todos (
-                            id UUID PRIMARY KEY,
-                            text TEXT NOT NULL,
-                            is_completed BOOLEAN DEFAULT FALSE,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                        )
-                    """))
-                    logger.info("Successfully created todos table")
-                except Exception as create_error:
-                    logger.error(f"Failed to create todos table: {create_error}")
+            # Serialize concurrent workers; the lock is released when the transaction ends
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            
+            # Both DDL statements are idempotent, so send them together in one round-trip
+            conn.execute(text("""
+                ALTER TABLE ideas ADD COLUMN IF NOT EXISTS is_unrefined BOOLEAN DEFAULT FALSE;
+                CREATE TABLE IF NOT EXISTS todos (
+                    id UUID PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    is_completed BOOLEAN DEFAULT FALSE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """))
+            logger.info("Ensured is_unrefined column and todos table exist")
                 
             logger.info("Manual migrations completed successfully")
             
         except Exception as e:
             logger.error(f"Manual migration failed: {e}")
             raise
+    
+    apply_index_migration()
+    apply_search_vector_migration()
+    apply_jsonb_migration()
+    apply_cascade_migration()
+    apply_trigram_index_migration()
+    
+    if settings.semantic_cache_enabled:
+        apply_semantic_cache_migration()
+
+def apply_optional_migration(description: str, ddl: str) -> bool:
+    """Run one optional migration step in its own locked transaction; log and carry on if it fails"""
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.execute(text(ddl))
+        logger.info(f"Ensured {description}")
+        return True
+    except Exception as e:
+        logger.warning(f"Migration for {description} failed, continuing without it: {e}")
+        return False
+
+def apply_index_migration():
+    """Create the secondary indexes for listings, lookups and cache purging"""
+    apply_optional_migration("secondary indexes", """
+        CREATE INDEX IF NOT EXISTS idx_plans_idea_active ON plans (idea_id) WHERE is_active;
+        CREATE INDEX IF NOT EXISTS idx_plans_idea_created ON plans (idea_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_refinement_sessions_idea_created ON refinement_sessions (idea_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_ideas_tags_gin ON ideas USING GIN (tags);
+        CREATE INDEX IF NOT EXISTS idx_ideas_updated_id ON ideas (updated_at, id);
+        CREATE INDEX IF NOT EXISTS idx_ideas_title_lower_pattern ON ideas (lower(title) text_pattern_ops);
+        CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_at);
+    """)
+
+def apply_search_vector_migration():
+    """Add the generated full-text search column (rewrites the ideas table the first time)"""
+    apply_optional_migration("search_vector column", f"""
+        ALTER TABLE ideas ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+            GENERATED ALWAYS AS ({IDEA_SEARCH_VECTOR_SQL}) STORED;
+        CREATE INDEX IF NOT EXISTS idx_ideas_search_vector ON ideas USING GIN (search_vector);
+    """)
+
+def apply_jsonb_migration():
+    """One-time conversion of legacy JSON columns to JSONB"""
+    apply_optional_migration("JSONB plan and session columns", """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = 'plans'::regclass AND attname = 'steps' AND atttypid = 'json'::regtype
+            ) THEN
+                ALTER TABLE plans
+                    ALTER COLUMN steps TYPE JSONB USING steps::jsonb,
+                    ALTER COLUMN resources TYPE JSONB USING resources::jsonb;
+            END IF;
+            IF EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = 'refinement_sessions'::regclass AND attname = 'questions' AND atttypid = 'json'::regtype
+            ) THEN
+                ALTER TABLE refinement_sessions
+                    ALTER COLUMN questions TYPE JSONB USING questions::jsonb,
+                    ALTER COLUMN answers TYPE JSONB USING answers::jsonb;
+            END IF;
+        END $$;
+    """)
+
+def apply_cascade_migration():
+    """Let Postgres cascade idea deletes to sessions and plans"""
+    apply_optional_migration("cascading idea foreign keys", """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'refinement_sessions_idea_id_fkey' AND confdeltype <> 'c'
+            ) THEN
+                ALTER TABLE refinement_sessions
+                    DROP CONSTRAINT refinement_sessions_idea_id_fkey,
+                    ADD CONSTRAINT refinement_sessions_idea_id_fkey
+                        FOREIGN KEY (idea_id) REFERENCES ideas (id) ON DELETE CASCADE;
+            END IF;
+            IF EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'plans_idea_id_fkey' AND confdeltype <> 'c'
+            ) THEN
+                ALTER TABLE plans
+                    DROP CONSTRAINT plans_idea_id_fkey,
+                    ADD CONSTRAINT plans_idea_id_fkey
+                        FOREIGN KEY (idea_id) REFERENCES ideas (id) ON DELETE CASCADE;
+            END IF;
+        END $$;
+    """)
+
+def apply_trigram_index_migration():
+    """Create pg_trgm GIN indexes for the substring (ILIKE '%term%') branch of idea search"""
+    # Separate transaction: a server that refuses CREATE EXTENSION must not roll back the core migrations
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.execute(text("""
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS idx_ideas_title_trgm ON ideas USING GIN (title gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS idx_ideas_description_trgm ON ideas USING GIN (original_description gin_trgm_ops);
+            """))
+        logger.info("Ensured trigram search indexes exist")
+    except Exception as e:
+        logger.warning(f"Trigram index migration failed, idea search will scan the table: {e}")
+
+def apply_semantic_cache_migration():
+    """Create the pgvector-backed plan cache table (only needed when the semantic cache is enabled)"""
+    # Separate transaction: a server without pgvector must not roll back the core migrations
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            conn.execute(text(f"""
+                CREATE EXTENSION IF NOT EXISTS vector;
+                CREATE TABLE IF NOT EXISTS idea_plan_cache (
+                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                    idea_id UUID NOT NULL REFERENCES ideas(id) ON DELETE CASCADE,
+                    embedding VECTOR({settings.openai_embedding_dimensions}) NOT NULL,
+                    plan_json TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                );
+                -- Tables created before rows recorded their source idea: those rows can't cascade, so drop them
+                ALTER TABLE idea_plan_cache ADD COLUMN IF NOT EXISTS idea_id UUID REFERENCES ideas(id) ON DELETE CASCADE;
+                DELETE FROM idea_plan_cache WHERE idea_id IS NULL;
+                ALTER TABLE idea_plan_cache ALTER COLUMN idea_id SET NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_idea_plan_cache_embedding
+                    ON idea_plan_cache USING hnsw (embedding vector_cosine_ops);
+                CREATE INDEX IF NOT EXISTS idx_idea_plan_cache_idea ON idea_plan_cache (idea_id);
+                CREATE INDEX IF NOT EXISTS idx_idea_plan_cache_created ON idea_plan_cache (created_at);
+            """))
+        logger.info("Ensured idea_plan_cache table exists")
+    except Exception as e:
+        logger.warning(f"Semantic cache migration failed, semantic cache will be unavailable: {e}")
 
 if __name__ == "__main__":
     apply_manual_migrations()
\ No newline at end of file
@@ -11,6 +11,8 @@ from config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NEW_ARCHITECTURE_TABLES = ['ideas', 'refinement_sessions', 'plans']
+
 def migrate_database():
     """
     Migrate database to new architecture
@@ -30,28 +32,28 @@ def migrate_database():
         
         # Show current database status
         with engine.connect() as conn:
-            # Check if tables exist
+            # List all public tables once, flagging which belong to the new architecture
+            # (pg_catalog lookups are much cheaper than information_schema views)
             result = conn.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name IN ('ideas', 'refinement_sessions', 'plans')
-                ORDER BY table_name;
-            """))
+                SELECT c.relname, c.relname = ANY(:names) AS is_new
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'public'
+                AND c.relkind = 'r'
+                ORDER BY c.relname;
+            """), {"names": NEW_ARCHITECTURE_TABLES})
+            
+            new_tables = []
+            old_tables = []
+            for table_name, is_new in result:
+                if is_new:
+                    new_tables.append(table_name)
+                else:
+                    old_tables.append(table_name)
             
-            new_tables = [row[0] for row in result.fetchall()]
             logger.info(f"✅ New architecture tables available: {new_tables}")
             
             # Check for old tables that might need migration
-            result = conn.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name NOT IN ('ideas', 'refinement_sessions', 'plans')
-                ORDER BY table_name;
-            """))
-            
-            old_tables = [row[0] for row in result.fetchall()]
             if old_tables:
                 logger.info(f"⚠️  Existing tables found: {old_tables}")
                 logger.info("These tables contain old data that may need manual migration")
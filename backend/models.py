@@ -1,10 +1,11 @@
 """
 Updated SQLAlchemy models for Bright Ideas - Structured Refinement System
 """
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID, JSON, ARRAY
+from sqlalchemy import Column, Computed, String, Text, DateTime, Boolean, ForeignKey, Enum, Index, and_, cast, func, or_, select, update
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
 from uuid import uuid4
 import enum
@@ -24,6 +25,12 @@ class PlanStatus(str, enum.Enum):
     edited = "edited"
     published = "published"
 
+# Weighted search document: title matches rank above description matches
+IDEA_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(original_description, '')), 'B')"
+)
+
 class Idea(Base):
     """Core idea entity - the starting point for everything"""
     __tablename__ = "ideas"
@@ -39,17 +46,36 @@ class Idea(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
+    # Full-text search document maintained by Postgres; deferred since only search filters read it
+    search_vector = deferred(Column(TSVECTOR, Computed(IDEA_SEARCH_VECTOR_SQL, persisted=True)))
+    
+    __table_args__ = (
+        # GIN index so tag containment filters (tags @> ARRAY[...]) can use an index
+        Index("idx_ideas_tags_gin", "tags", postgresql_using="gin"),
+        Index("idx_ideas_search_vector", "search_vector", postgresql_using="gin"),
+        # Newest-first listing with keyset pagination on (updated_at, id)
+        Index("idx_ideas_updated_id", "updated_at", "id"),
+        # B-tree range scans for single-word title prefix search (lower(title) LIKE 'term%')
+        Index(
+            "idx_ideas_title_lower_pattern",
+            func.lower(title).label("title_lower"),
+            postgresql_ops={"title_lower": "text_pattern_ops"}
+        ),
+    )
+    
+    # Relationships; children are removed by ON DELETE CASCADE, so deletes don't load them
     refinement_sessions = relationship(
         "RefinementSession", 
         back_populates="idea", 
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="RefinementSession.created_at.desc()"
     )
     plans = relationship(
         "Plan", 
         back_populates="idea", 
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Plan.created_at.desc()"
     )
 
@@ -71,13 +97,13 @@ class RefinementSession(Base):
     __tablename__ = "refinement_sessions"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    idea_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id"), nullable=False)
+    idea_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id", ondelete="CASCADE"), nullable=False)
     
     # AI-generated questions and user answers
-    questions = Column(JSON, nullable=False)  
+    questions = Column(JSONB, nullable=False)  
     # Format: [{"id": "q1", "question": "Who are the target users?"}, ...]
     
-    answers = Column(JSON, default=dict)      
+    answers = Column(JSONB, default=dict)      
     # Format: {"q1": "Busy professionals who get 50+ newsletters", "q2": "..."}
     
     # Session metadata
@@ -92,6 +118,10 @@ class RefinementSession(Base):
     idea = relationship("Idea", back_populates="refinement_sessions")
     plans = relationship("Plan", back_populates="refinement_session")
 
+    __table_args__ = (
+        Index("idx_refinement_sessions_idea_created", "idea_id", "created_at"),
+    )
+
     def mark_complete(self):
         """Mark this session as complete"""
         self.is_complete = True
@@ -108,18 +138,31 @@ class Todo(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class LLMCacheEntry(Base):
+    """Cached LLM completion, keyed by a hash of the full request"""
+    __tablename__ = "llm_cache"
+    
+    key = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Range deletes of expired entries
+        Index("idx_llm_cache_created", "created_at"),
+    )
+
 class Plan(Base):
     """Generated implementation plan based on refined idea"""
     __tablename__ = "plans"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    idea_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id"), nullable=False)
+    idea_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id", ondelete="CASCADE"), nullable=False)
     refinement_session_id = Column(UUID(as_uuid=True), ForeignKey("refinement_sessions.id"), nullable=True)
     
     # Plan content (structured)
     summary = Column(Text, nullable=False)  # 1-paragraph overview
-    steps = Column(JSON, nullable=False)    # [{"order": 1, "title": "...", "description": "...", "estimated_time": "2 hours"}]
-    resources = Column(JSON, default=list) # [{"title": "Figma", "url": "...", "type": "tool", "description": "..."}]
+    steps = Column(JSONB, nullable=False)    # [{"order": 1, "title": "...", "description": "...", "estimated_time": "2 hours"}]
+    resources = Column(JSONB, default=list) # [{"title": "Figma", "url": "...", "type": "tool", "description": "..."}]
     
     # Plan metadata
     status = Column(Enum(PlanStatus), default=PlanStatus.generated)
@@ -135,13 +178,51 @@ class Plan(Base):
     idea = relationship("Idea", back_populates="plans")
     refinement_session = relationship("RefinementSession", back_populates="plans")
 
-    def activate(self):
+    __table_args__ = (
+        # Partial index: at most one active plan per idea, found without scanning the rest
+        Index("idx_plans_idea_active", "idea_id", postgresql_where=is_active),
+        # Newest-first plan listing per idea
+        Index("idx_plans_idea_created", "idea_id", "created_at"),
+    )
+
+    def activate(self, session):
         """Make this the active plan (deactivates others for same idea)"""
-        # Deactivate other plans for this idea
-        for plan in self.idea.plans:
-            if plan.id != self.id:
-                plan.is_active = False
-        self.is_active = True
+        # One UPDATE, without loading the plans; only the currently active plan and this
+        # one are touched, so other plans keep their updated_at
+        now = datetime.utcnow()
+        session.execute(
+            update(Plan)
+            .where(and_(
+                Plan.idea_id == self.idea_id,
+                or_(Plan.is_active.is_(True), Plan.id == self.id)
+            ))
+            .values(is_active=(Plan.id == self.id), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        # Reflect the new state without scheduling a second UPDATE on flush
+        set_committed_value(self, "is_active", True)
+        set_committed_value(self, "updated_at", now)
+
+    @classmethod
+    def export_query(cls, session, plan_id):
+        """Build the export dictionary in SQL (same shape as to_export_dict), or None if the plan doesn't exist"""
+        export = func.jsonb_build_object(
+            "idea", func.jsonb_build_object(
+                "title", Idea.title,
+                "description", Idea.original_description,
+                "tags", Idea.tags
+            ),
+            "plan", func.jsonb_build_object(
+                "summary", cls.summary,
+                "steps", cls.steps,
+                "resources", cls.resources,
+                "status", cast(cls.status, String)
+            ),
+            type_=JSONB
+        )
+        return session.execute(
+            select(export).select_from(cls).join(Idea, Idea.id == cls.idea_id).where(cls.id == plan_id)
+        ).scalar_one_or_none()
 
     def to_export_dict(self):
         """Generate export-ready dictionary"""
@@ -2,8 +2,9 @@
 Updated Pydantic schemas for Bright Ideas - Structured Refinement System
 """
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from uuid import UUID
+import orjson
 from pydantic import BaseModel, Field, field_validator
 
 # Todo Schemas
@@ -40,17 +41,17 @@ class IdeaCreate(BaseModel):
     @classmethod
     def validate_tags(cls, v):
         """Ensure tags is always a list, even if sent as string"""
-        if isinstance(v, str):
+        # Fast path: API clients almost always send a list
+        if isinstance(v, list):
+            return v
+        elif isinstance(v, str):
             if v.strip() == '' or v.strip() == '[]':
                 return []
             try:
-                import json
-                parsed = json.loads(v)
+                parsed = orjson.loads(v)
                 return parsed if isinstance(parsed, list) else []
-            except (json.JSONDecodeError, TypeError):
+            except orjson.JSONDecodeError:
                 return []
-        elif isinstance(v, list):
-            return v
         else:
             return []
 
@@ -59,7 +60,7 @@ class IdeaUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     original_description: Optional[str] = None
     tags: Optional[List[str]] = None
-    status: Optional[str] = Field(None, pattern="^(captured|refining|planned|archived)$")
+    status: Optional[Literal["captured", "refining", "planned", "archived"]] = None
     is_unrefined: Optional[bool] = None
 
 class IdeaResponse(BaseModel):
@@ -140,7 +141,7 @@ class PlanUpdate(BaseModel):
     summary: Optional[str] = None
     steps: Optional[List[PlanStep]] = None
     resources: Optional[List[PlanResource]] = None
-    status: Optional[str] = Field(None, pattern="^(draft|generated|edited|published)$")
+    status: Optional[Literal["draft", "generated", "edited", "published"]] = None
 
 class PlanUpload(BaseModel):
     """Schema for uploading a full plan via text/markdown"""
@@ -189,7 +190,12 @@ class PlanGenerationResponse(BaseModel):
     """Schema for AI-generated plan response"""
     summary: str
     steps: List[PlanStep]  
-    resources: List[PlanResource]
+    resources: List[PlanResource] = Field(default_factory=list)
+
+class QuestionsAndPlanResponse(BaseModel):
+    """Schema for AI-generated questions plus a tentative plan in a single response"""
+    questions: List[RefinementQuestion]
+    tentative_plan: PlanGenerationResponse
 
 # Update forward references
 IdeaDetailResponse.model_rebuild()
\ No newline at end of file
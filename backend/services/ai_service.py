@@ -1,29 +1,326 @@
 """
 AI Service for generating questions and plans using OpenAI
 """
-import json
+import asyncio
+import hashlib
 import logging
 import re
-from typing import List, Dict, Any, Tuple
-from openai import OpenAI
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+import ijson
+from pydantic import BaseModel, ValidationError
 from config import settings
+from services import llm_cache, semantic_cache
 from schemas import (
     RefinementQuestion, 
     PlanStep, 
     PlanResource,
     QuestionGenerationResponse,
-    PlanGenerationResponse
+    PlanGenerationResponse,
+    QuestionsAndPlanResponse
 )
 
 logger = logging.getLogger(__name__)
 
-class AIService:
-    def __init__(self):
-        self.client = OpenAI(
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+# Output token budget for plan generation, scaled between these by idea length
+PLAN_MIN_TOKENS = 1000
+PLAN_MAX_TOKENS = 2000
+
+# Descriptions longer than this carry enough context to draft a tentative plan
+# alongside the first questions, in a single LLM call
+TENTATIVE_PLAN_MIN_DESCRIPTION_LENGTH = 400
+
+# Prompt templates, built once at import and filled in with str.format_map.
+# Static instructions come first and per-idea content last, so repeated requests
+# share the longest possible prefix for OpenAI's automatic prompt caching.
+QUESTION_PROMPT_TEMPLATE = """You are an expert consultant helping someone refine their business idea. 
+
+Generate 3-7 specific, thoughtful questions that will help clarify and improve the idea below. Focus on:
+- Target audience and users
+- Implementation approach  
+- Market positioning
+- Technical requirements
+- Business model considerations
+
+Return ONLY JSON: {{"questions": [{{"id": "q1", "question": "Who specifically are your target users?"}}, ...]}}
+
+Make each question specific to this idea. Avoid generic questions.
+
+Idea:
+Title: "{title}"
+Description: "{description}\""""
+
+FOLLOWUP_QUESTION_PROMPT_TEMPLATE = """You are an expert consultant helping someone continue refining their business idea. 
+
+Since this person is continuing their refinement process, generate 3-7 specific, thoughtful questions that BUILD ON what they've already explored (shown below the idea). Focus on:
+- Addressing gaps or unclear areas from previous discussions
+- Diving deeper into aspects that need more detail
+- Exploring new angles that emerged from their current plan
+- Refining implementation details or go-to-market strategy
+
+AVOID repeating questions already answered. Instead, ask follow-up questions or explore new dimensions.
+
+Return ONLY JSON: {{"questions": [{{"id": "q1", "question": "Your plan mentions [specific element] - what's your strategy for [deeper aspect]?"}}, ...]}}
+
+Make each question specific to this idea and build on their existing work.
+
+CURRENT IDEA:
+Title: "{title}"
+Description: "{description}"
+{context_text}"""
+
+PLAN_PROMPT_TEMPLATE = """Create a CONCRETE, ACTIONABLE implementation plan for the idea at the end of this message.
+
+IMPORTANT: Give me SPECIFIC, EXECUTABLE steps with actual tool names, library choices, and implementation details.
+DO NOT give me generic advice like "Define requirements" or "Set up infrastructure".
+I want steps like "Install Scrapy with 'pip install scrapy'" or "Create PostgreSQL schema with these exact tables".
+
+EVERY step must be something I can DO, not something to THINK ABOUT.
+Bad: "Design the data model"
+Good: "Create PostgreSQL tables: blogs(id, url, title, content, scraped_at), summaries(id, blog_id, summary_text)"
+
+Return ONLY a JSON object in this exact format:
+{{
+  "summary": "A clear paragraph describing the refined concept, its target users, and core value proposition...",
+  "steps": [
+    {{"order": 1, "title": "[Specific component/layer name]", "description": "[What this component does and why it's needed]", "estimated_time": "[Realistic time estimate]"}},
+    {{"order": 2, "title": "[Another specific component]", "description": "[Its purpose and implementation approach]", "estimated_time": "[Time estimate]"}}
+  ],
+  "resources": [
+    {{"title": "[Specific tool/service name]", "url": "[actual URL if applicable]", "type": "[tool/service/reference]", "description": "[Why this specific resource helps]"}}
+  ]
+}}
+
+Make each step and resource specific to this exact idea. Focus on WHAT needs to be built and HOW the pieces fit together.
+
+{breakdown_approach}
+
+Write the plan as {persona}.
+
+Original Idea:
+Title: "{title}"
+Description: "{description}"
+
+Refinement Details:
+{answers_text}"""
+
+# Plan system message; the persona is appended last so the prefix stays identical across requests
+PLAN_SYSTEM_PROMPT = "You create SPECIFIC, ACTIONABLE implementation steps. Always respond with valid JSON only. Every step must be concrete and executable, like 'pip install X' or 'create this exact function'. NO GENERIC ADVICE. You are {persona}."
+
+# Appended to the plan prompt when questions and a tentative plan are generated together
+TENTATIVE_PLAN_PROMPT_SUFFIX = """
+
+No refinement answers exist yet, so treat this plan as TENTATIVE. Also generate 3-7 specific questions whose answers would most improve it.
+Instead of the plan object alone, return ONLY JSON: {"questions": [{"id": "q1", "question": "..."}, ...], "tentative_plan": {the plan object in the format above}}"""
+
+# Project type detection keywords, checked in priority order: technical/scraping
+# tools come BEFORE content (since scrapers often mention 'blog' but are tools).
+# Each bucket is one precompiled case-insensitive alternation of plain substrings.
+PROJECT_TYPE_PATTERNS = tuple(
+    (project_type, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+    for project_type, keywords in (
+        ("technical_tool", ['scrape', 'scraper', 'crawl', 'crawler', 'download', 'extract', 'search internet', 'api', 'data pipeline', 'etl', 'automation', 'bot', 'script', 'cli', 'summarize']),
+        ("content_creation", ['newsletter', 'course', 'book', 'writing', 'publish', 'content creation']),
+        ("business_service", ['marketplace', 'ecommerce', 'subscription', 'saas', 'platform', 'service']),
+        ("research_analysis", ['research', 'analysis', 'study', 'survey', 'report', 'dashboard']),
+        ("application", ['app', 'mobile', 'web app', 'website', 'frontend', 'ui']),
+        ("community_platform", ['community', 'network', 'forum', 'social', 'group']),
+    )
+)
+
+PROJECT_PERSONAS = {
+    "technical_tool": "a solutions architect",
+    "content_creation": "a content strategist",
+    "business_service": "a business analyst",
+    "research_analysis": "a research analyst",
+    "application": "a product architect",
+    "community_platform": "a community strategist",
+    "general": "a strategic consultant",
+}
+
+# Plan breakdown guidance that varies by project type
+BREAKDOWN_APPROACHES = {
+    "technical_tool": """Create a SPECIFIC, ACTIONABLE implementation plan. I want concrete steps I can execute, not vague concepts.
+
+For this exact tool, answer:
+
+1. DATA SOURCES: What EXACT websites/APIs will you scrape? List specific RV blog domains or use a discovery method.
+
+2. SCRAPING APPROACH: Which specific library (BeautifulSoup, Scrapy, Playwright)? What's the exact extraction logic?
+
+3. SUMMARIZATION: Use OpenAI API? Which model? What prompt? Or use extractive summarization (which library)?
+
+4. STORAGE: SQLite? PostgreSQL? JSON files? What's the exact schema?
+
+5. DEDUPLICATION: How exactly will you avoid reprocessing? URL hashing? Content fingerprinting?
+
+6. OUTPUT: CLI with what commands? Web UI? API endpoints? Be specific.
+
+7. MVP SCOPE: What's the absolute minimum that works? Start with 3 specific RV blogs?
+
+Give me steps I can code TODAY, not abstract concepts.""",
+    
+    "content_creation": """Break down this project by content operations and distribution:
+- What content creation or curation process is needed?
+- What tools and workflows will streamline production?
+- How will content be organized and discovered?
+- What distribution channels make sense?
+- What's the minimum viable content strategy?""",
+    
+    "business_service": """Break down this project by business operations and value delivery:
+- What's the core value proposition and how is it delivered?
+- What operational processes are needed?
+- How will customers discover and engage with this?
+- What's the revenue model and pricing strategy?
+- What's the leanest path to first paying customer?""",
+    
+    "research_analysis": """Break down this project by data collection and insight generation:
+- What data needs to be collected and from where?
+- What analysis methods will generate insights?
+- How will findings be validated and presented?
+- What tools enable efficient research workflow?
+- What's the minimum viable research output?""",
+    
+    "application": """Break down this project by user experience and system design:
+- What are the core user flows and features?
+- What's the data model and state management approach?
+- What integrations or APIs are needed?
+- What's the simplest deployable version?
+- What are the key technical and UX decisions?""",
+    
+    "community_platform": """Break down this project by community dynamics and engagement:
+- What brings people together and keeps them engaged?
+- What moderation and governance is needed?
+- How will the community grow and stay healthy?
+- What features enable meaningful connections?
+- What's the minimum viable community experience?""",
+    
+    "general": """Break down this project by its core components and dependencies:
+- What are the main functional components?
+- How do these components interact?
+- What are the critical dependencies?
+- What's the simplest working version?
+- What are the key decisions and trade-offs?"""
+}
+
+# Static fallback plan content, built once with model_construct (the values are
+# known-good, so there is nothing to validate) and copied into each fallback plan
+FALLBACK_TECHNICAL_TOOL_STEPS = (
+    PlanStep.model_construct(order=1, title="Install Scrapy & Setup Project", description="pip install scrapy beautifulsoup4 openai && scrapy startproject rv_scraper", estimated_time="30 minutes"),
+    PlanStep.model_construct(order=2, title="Build RV Blog Spider", description="Create spider to crawl rvlife.com, loveyourrv.com, and rvwithmill.com - extract title, content, date", estimated_time="2-3 days"),
+    PlanStep.model_construct(order=3, title="OpenAI Summarization Pipeline", description="Implement GPT-4 API calls with prompt: 'Extract key RV tips and insights from this blog post'", estimated_time="1 day"),
+    PlanStep.model_construct(order=4, title="SQLite Storage with Deduplication", description="Create blogs table with URL hash index, implement 'seen URLs' check before processing", estimated_time="1 day"),
+    PlanStep.model_construct(order=5, title="CLI Commands", description="python rv_scraper.py --scrape (fetch new) --summary ID (show summary) --export (JSON dump)", estimated_time="1 day"),
+)
+
+FALLBACK_CONTENT_CREATION_STEPS = (
+    PlanStep.model_construct(order=1, title="Content Strategy & Templates", description="Define content types and create templates", estimated_time="3-4 days"),
+    PlanStep.model_construct(order=2, title="Creation Workflow", description="Set up tools and processes for content production", estimated_time="1 week"),
+    PlanStep.model_construct(order=3, title="Organization System", description="Build categorization and tagging structure", estimated_time="3-4 days"),
+    PlanStep.model_construct(order=4, title="Distribution Channels", description="Set up publishing and distribution methods", estimated_time="1 week"),
+    PlanStep.model_construct(order=5, title="Analytics & Feedback", description="Implement tracking and audience feedback loops", estimated_time="3-4 days"),
+)
+
+# Generic but still avoiding phase-based structure
+FALLBACK_GENERAL_STEPS = (
+    PlanStep.model_construct(order=1, title="Core Functionality", description="Define and build the main value-delivering features", estimated_time="2-3 weeks"),
+    PlanStep.model_construct(order=2, title="User Interface", description="Create the interface for user interaction", estimated_time="1-2 weeks"),
+    PlanStep.model_construct(order=3, title="Data Management", description="Set up data storage and retrieval systems", estimated_time="1 week"),
+    PlanStep.model_construct(order=4, title="Integration Points", description="Connect with necessary external services", estimated_time="1 week"),
+    PlanStep.model_construct(order=5, title="Deployment & Operations", description="Set up hosting and operational processes", estimated_time="3-4 days"),
+)
+
+# Project types without their own fallback steps use the general ones
+FALLBACK_STEPS = {
+    "technical_tool": FALLBACK_TECHNICAL_TOOL_STEPS,
+    "content_creation": FALLBACK_CONTENT_CREATION_STEPS,
+    "general": FALLBACK_GENERAL_STEPS,
+}
+
+FALLBACK_RESOURCES = (
+    PlanResource.model_construct(title="Documentation Tool", type="tool", description="Use Notion, Obsidian, or similar for project documentation"),
+    PlanResource.model_construct(title="Version Control", type="tool", description="Git repository for tracking changes and collaboration"),
+)
+
+
+# Process-wide OpenAI client, shared by every AIService so all calls reuse one pool
+# of keep-alive (HTTP/2 multiplexed) connections instead of one pool per instance
+_openai_client = None
+
+# Caps in-flight OpenAI requests (completions, streams and embeddings) across every
+# AIService in the process, so routers with their own instance share one budget
+_request_slots = asyncio.Semaphore(settings.openai_concurrency)
+
+
+def get_openai_client():
+    """Return the shared AsyncOpenAI client, creating it on first use"""
+    global _openai_client
+    if _openai_client is None:
+        # Imported here so modules that only need the schemas or the fallback
+        # content (e.g. migration scripts) don't pay for loading the openai SDK
+        import httpx
+        from openai import AsyncOpenAI
+        _openai_client = AsyncOpenAI(
             api_key=settings.openai_api_key,
-            timeout=settings.openai_timeout
+            timeout=settings.openai_timeout,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=50, keepalive_expiry=60),
+                timeout=settings.openai_timeout
+            )
         )
+    return _openai_client
+
+
+async def warm_openai_client(timeout: float = 5.0):
+    """Open a connection to the OpenAI API ahead of the first request (DNS, TLS, HTTP/2 setup)"""
+    try:
+        await asyncio.wait_for(get_openai_client().models.list(), timeout)
+        logger.info("OpenAI client connection warmed")
+    except Exception as e:
+        logger.warning(f"Failed to warm OpenAI client connection: {e}")
+
+
+async def close_openai_client():
+    """Close the shared OpenAI client's connections (called on app shutdown)"""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
+class AIService:
+    def __init__(self):
+        self.client = get_openai_client()
         self.model = settings.openai_model
+        self.small_model = settings.openai_model_small
+
+    async def _create_completion(self, response_model: Type[ResponseModel], use_cache: bool = False, **kwargs) -> ResponseModel:
+        """
+        Issue a chat completion request and validate its JSON content into response_model
+        With use_cache, identical requests are served from the LLM cache; only validated
+        responses are stored. Question and plan generation pass settings.llm_cache_enabled,
+        so retries and repeated calls for unchanged input skip the OpenAI round-trip
+        """
+        cache_key = llm_cache.cache_key(kwargs) if use_cache and settings.llm_cache_enabled else None
+        if cache_key:
+            cached = await asyncio.to_thread(llm_cache.get_cached_completion, cache_key)
+            if cached is not None:
+                try:
+                    return response_model.model_validate_json(cached)
+                except ValidationError:
+                    logger.warning(f"Ignoring cached completion that no longer validates: {cache_key}")
+
+        async with _request_slots:
+            response = await self.client.chat.completions.create(**kwargs)
+
+        content = response.choices[0].message.content
+        result = response_model.model_validate_json(content)
+        if cache_key:
+            await asyncio.to_thread(llm_cache.store_completion, cache_key, content)
+        return result
 
     async def generate_refinement_questions(
         self, 
@@ -63,80 +360,38 @@ class AIService:
                         context_text += f"  - {getattr(step, 'title', 'Step')}: {getattr(step, 'description', '')}\n"
             context_text += "\n"
 
-        base_prompt = f"""You are an expert consultant helping someone continue refining their business idea. 
-
-CURRENT IDEA:
-Title: "{title}"
-Description: "{description}"
-
-{context_text}
-
-Since this person is continuing their refinement process, generate 3-7 specific, thoughtful questions that BUILD ON what they've already explored. Focus on:
-- Addressing gaps or unclear areas from previous discussions
-- Diving deeper into aspects that need more detail
-- Exploring new angles that emerged from their current plan
-- Refining implementation details or go-to-market strategy
-
-AVOID repeating questions already answered. Instead, ask follow-up questions or explore new dimensions.
-
-Return ONLY a JSON array of questions in this exact format:
-[
-  {{"id": "q1", "question": "Based on your current approach, how will you handle [specific challenge from their plan]?"}},
-  {{"id": "q2", "question": "Your plan mentions [specific element] - what's your strategy for [deeper aspect]?"}},
-  {{"id": "q3", "question": "Given what you've learned, how might you [specific improvement or alternative]?"}}
-]
-
-Make each question specific to this idea and build on their existing work."""
-
-        prompt = base_prompt if context_text.strip() else f"""You are an expert consultant helping someone refine their business idea. 
-
-Given this idea:
-Title: "{title}"
-Description: "{description}"
-
-Generate 3-7 specific, thoughtful questions that will help clarify and improve this idea. Focus on:
-- Target audience and users
-- Implementation approach  
-- Market positioning
-- Technical requirements
-- Business model considerations
-
-Return ONLY a JSON array of questions in this exact format:
-[
-  {{"id": "q1", "question": "Who specifically are your target users and what problem does this solve for them?"}},
-  {{"id": "q2", "question": "How do you envision users accessing this - web app, mobile app, browser extension, or API?"}},
-  {{"id": "q3", "question": "What existing solutions are you competing with and how is yours different?"}}
-]
-
-Make each question specific to this idea. Avoid generic questions."""
+        template = FOLLOWUP_QUESTION_PROMPT_TEMPLATE if context_text.strip() else QUESTION_PROMPT_TEMPLATE
+        prompt = template.format_map({
+            "title": title,
+            "description": description,
+            "context_text": context_text
+        })
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # JSON mode guarantees valid JSON; it is validated straight into the response schema
+            # Repeats are served by the llm_cache table rather than an in-process LRU: it is
+            # shared by all workers, survives restarts and keys on the full prompt, so
+            # follow-up questions built from previous sessions never collide
+            questions = (await self._create_completion(
+                QuestionGenerationResponse,
+                use_cache=settings.llm_cache_enabled,
+                model=self.small_model,
                 messages=[
                     {"role": "system", "content": "You are a helpful business consultant. Always respond with valid JSON only."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=1000
-            )
-            
-            questions_json = response.choices[0].message.content.strip()
-            logger.info(f"Generated questions JSON: {questions_json}")
-            
-            # Parse JSON response
-            questions_data = json.loads(questions_json)
-            
-            # Convert to RefinementQuestion objects
-            questions = [
-                RefinementQuestion(id=q["id"], question=q["question"]) 
-                for q in questions_data
-            ]
+                # 3-7 short questions fit comfortably in a few hundred tokens
+                max_tokens=400,
+                # Seeded per title so repeated requests for an idea sample consistently
+                seed=int.from_bytes(hashlib.blake2b(title.encode(), digest_size=4).digest(), "big"),
+                response_format={"type": "json_object"}
+            )).questions
             
             logger.info(f"Generated {len(questions)} questions for idea: {title}")
             return questions
             
-        except json.JSONDecodeError as e:
+        except ValidationError as e:
             logger.error(f"Failed to parse LLM questions response: {e}")
             # Fallback to generic questions
             return self._get_fallback_questions()
@@ -144,206 +399,275 @@ Make each question specific to this idea. Avoid generic questions."""
             logger.error(f"Failed to generate questions: {e}")
             return self._get_fallback_questions()
 
-    async def generate_plan(self, title: str, description: str, answers: Dict[str, str]) -> Dict[str, Any]:
+    async def generate_plan(
+        self,
+        title: str,
+        description: str,
+        answers: Dict[str, str],
+        idea_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
         """
         Generate an implementation plan based on idea and refinement answers
         """
-        # Format answers for the prompt
-        answers_text = "\n".join([
-            f"Q: {question_id}\nA: {answer}" 
-            for question_id, answer in answers.items()
-        ])
-
-        # Detect project type and get contextual prompt
-        project_type, persona = self._detect_project_type(title, description, answers)
-        prompt = self._get_contextual_prompt(project_type, persona, title, description, answers_text)
-        
-        logger.info(f"Generating plan for project type: {project_type} with persona: {persona}")
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": f"You are {persona} creating SPECIFIC, ACTIONABLE implementation steps. Always respond with valid JSON only. Every step must be concrete and executable, like 'pip install X' or 'create this exact function'. NO GENERIC ADVICE."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
+            plan = await self.generate_plan_or_raise(
+                title, description, answers, idea_id=idea_id, use_cache=settings.llm_cache_enabled
             )
             
-            plan_json = response.choices[0].message.content.strip()
-            logger.info(f"Generated plan for {project_type} project. Response length: {len(plan_json)}")
-            logger.debug(f"Plan JSON preview: {plan_json[:500]}...")
-            
-            # Parse JSON response
-            plan_data = json.loads(plan_json)
-            
-            # Convert steps and resources to proper objects
-            steps = [
-                PlanStep(
-                    order=step["order"],
-                    title=step["title"], 
-                    description=step["description"],
-                    estimated_time=step.get("estimated_time")
-                ) for step in plan_data["steps"]
-            ]
-            
-            resources = [
-                PlanResource(
-                    title=res["title"],
-                    url=res.get("url"),
-                    type=res.get("type", "tool"),
-                    description=res.get("description")
-                ) for res in plan_data.get("resources", [])
-            ]
-            
             result = {
-                "summary": plan_data["summary"],
-                "steps": steps,
-                "resources": resources
+                "summary": plan.summary,
+                "steps": plan.steps,
+                "resources": plan.resources
             }
             
-            logger.info(f"Generated plan with {len(steps)} steps and {len(resources)} resources")
+            logger.info(f"Generated plan with {len(plan.steps)} steps and {len(plan.resources)} resources")
             return result
             
-        except json.JSONDecodeError as e:
+        except ValidationError as e:
             logger.error(f"Failed to parse LLM plan response: {e}")
-            logger.error(f"Raw response that failed to parse: {plan_json if 'plan_json' in locals() else 'No response received'}")
             return self._get_fallback_plan(title, description)
         except Exception as e:
-            logger.error(f"Failed to generate plan for {project_type} project: {e}")
+            logger.error(f"Failed to generate plan: {e}")
             logger.error(f"Full error details: {str(e)}")
             return self._get_fallback_plan(title, description)
 
-    def _detect_project_type(self, title: str, description: str, answers: Dict[str, str] = None) -> Tuple[str, str]:
+    async def generate_plan_or_raise(
+        self,
+        title: str,
+        description: str,
+        answers: Dict[str, str],
+        idea_id: Optional[UUID] = None,
+        use_cache: bool = False
+    ) -> PlanGenerationResponse:
         """
-        Detect the project type based on content to select appropriate prompt template
-        Returns: (project_type, persona)
+        Generate an implementation plan, raising on failure instead of falling back
+        (for callers that retry, such as batch generation, which can also reuse
+        completions cached for identical requests with use_cache)
         """
-        combined_text = f"{title} {description}".lower()
-        if answers:
-            combined_text += " " + " ".join(answers.values()).lower()
+        project_type, persona, messages = self._build_plan_messages(title, description, answers)
         
-        # Detection patterns for different project types
-        # Check for technical/scraping tools BEFORE content (since scrapers often mention 'blog' but are tools)
-        if any(word in combined_text for word in ['scrape', 'scraper', 'crawl', 'crawler', 'download', 'extract', 'search internet', 'api', 'data pipeline', 'etl', 'automation', 'bot', 'script', 'cli', 'summarize']):
-            return "technical_tool", "a solutions architect"
-        elif any(word in combined_text for word in ['newsletter', 'course', 'book', 'writing', 'publish', 'content creation']):
-            return "content_creation", "a content strategist"
-        elif any(word in combined_text for word in ['marketplace', 'ecommerce', 'subscription', 'saas', 'platform', 'service']):
-            return "business_service", "a business analyst"
-        elif any(word in combined_text for word in ['research', 'analysis', 'study', 'survey', 'report', 'dashboard']):
-            return "research_analysis", "a research analyst"
-        elif any(word in combined_text for word in ['app', 'mobile', 'web app', 'website', 'frontend', 'ui']):
-            return "application", "a product architect"
-        elif any(word in combined_text for word in ['community', 'network', 'forum', 'social', 'group']):
-            return "community_platform", "a community strategist"
-        else:
-            return "general", "a strategic consultant"
+        logger.info(f"Generating plan for project type: {project_type} with persona: {persona}")
 
-    def _get_contextual_prompt(self, project_type: str, persona: str, title: str, description: str, answers_text: str) -> str:
+        # Near-duplicate ideas (reworded title/description, same answers) reuse a stored plan;
+        # stored plans are tied to their idea, so callers without one skip the cache
+        use_semantic_cache = settings.semantic_cache_enabled and idea_id is not None
+        embedding = await self._embed_idea(title, description, answers) if use_semantic_cache else None
+        cached_plan = await asyncio.to_thread(semantic_cache.find_similar_plan, embedding) if embedding else None
+        if cached_plan is not None:
+            return PlanGenerationResponse.model_validate_json(cached_plan)
+        
+        # JSON mode guarantees valid JSON; it is validated straight into the response schema
+        plan = await self._create_completion(
+            PlanGenerationResponse,
+            use_cache=use_cache,
+            model=self.model,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=self._plan_max_tokens(title, description, answers),
+            response_format={"type": "json_object"}
+        )
+        logger.info(f"Generated plan for {project_type} project")
+        if embedding:
+            await asyncio.to_thread(semantic_cache.store_plan, idea_id, embedding, plan.model_dump_json())
+        return plan
+
+    async def _embed_idea(self, title: str, description: str, answers: Dict[str, str]) -> Optional[List[float]]:
+        """Embed an idea and its refinement answers for the semantic plan cache, or None on failure"""
+        answers_text = "\n".join(answers.values())
+        try:
+            async with _request_slots:
+                response = await self.client.embeddings.create(
+                    model=settings.openai_embedding_model,
+                    input=f"{title}\n{description}\n{answers_text}"
+                )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Failed to embed idea for semantic cache: {e}")
+            return None
+
+    async def generate_questions_and_tentative_plan(self, title: str, description: str) -> Dict[str, Any]:
         """
-        Generate a context-aware prompt based on project type
+        Generate first-round questions and, for detailed descriptions, a tentative plan in one LLM call
+        (only with settings.tentative_plan_enabled; otherwise just the questions, on the small model)
+        Returns: {"questions": [...], "tentative_plan": {"summary", "steps", "resources"} or None}
         """
-        # Base context that varies by project type
-        context_templates = {
-            "technical_tool": """Create a SPECIFIC, ACTIONABLE implementation plan. I want concrete steps I can execute, not vague concepts.
+        if not settings.tentative_plan_enabled or len(description) <= TENTATIVE_PLAN_MIN_DESCRIPTION_LENGTH:
+            questions = await self.generate_refinement_questions(title, description)
+            return {"questions": questions, "tentative_plan": None}
 
-For this exact tool, answer:
-
-1. DATA SOURCES: What EXACT websites/APIs will you scrape? List specific RV blog domains or use a discovery method.
-
-2. SCRAPING APPROACH: Which specific library (BeautifulSoup, Scrapy, Playwright)? What's the exact extraction logic?
+        project_type, persona, messages = self._build_plan_messages(title, description, {})
+        messages[-1]["content"] += TENTATIVE_PLAN_PROMPT_SUFFIX
 
-3. SUMMARIZATION: Use OpenAI API? Which model? What prompt? Or use extractive summarization (which library)?
+        logger.info(f"Generating questions and tentative plan for project type: {project_type}")
 
-4. STORAGE: SQLite? PostgreSQL? JSON files? What's the exact schema?
+        try:
+            combined = await self._create_completion(
+                QuestionsAndPlanResponse,
+                model=self.model,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=2400,
+                response_format={"type": "json_object"}
+            )
+            plan = combined.tentative_plan
+
+            logger.info(f"Generated {len(combined.questions)} questions and a tentative plan with {len(plan.steps)} steps for idea: {title}")
+            return {
+                "questions": combined.questions,
+                "tentative_plan": {
+                    "summary": plan.summary,
+                    "steps": plan.steps,
+                    "resources": plan.resources
+                }
+            }
 
-5. DEDUPLICATION: How exactly will you avoid reprocessing? URL hashing? Content fingerprinting?
+        except Exception as e:
+            # A fallback plan is no use as a tentative plan, so just ask the questions
+            logger.error(f"Failed to generate questions and tentative plan: {e}")
+            questions = await self.generate_refinement_questions(title, description)
+            return {"questions": questions, "tentative_plan": None}
 
-6. OUTPUT: CLI with what commands? Web UI? API endpoints? Be specific.
+    async def generate_plan_stream(
+        self, 
+        title: str, 
+        description: str, 
+        answers: Dict[str, str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an implementation plan as the LLM generates it.
+        
+        Yields {"event": "summary"} and {"event": "step"} items as soon as each is
+        complete in the streamed JSON, then a final {"event": "plan"} item with the
+        full plan (same shape as generate_plan). On failure before anything was
+        yielded the final item is the fallback plan; once previews have gone out it
+        is {"event": "error"} instead, so the client never gets a plan that doesn't
+        match them.
+        """
+        project_type, persona, messages = self._build_plan_messages(title, description, answers)
+        
+        logger.info(f"Streaming plan for project type: {project_type} with persona: {persona}")
 
-7. MVP SCOPE: What's the absolute minimum that works? Start with 3 specific RV blogs?
+        # Incremental JSON parsers, fed with every streamed chunk
+        summaries = ijson.sendable_list()
+        steps = ijson.sendable_list()
+        summary_parser = ijson.items_coro(summaries, "summary")
+        steps_parser = ijson.items_coro(steps, "steps.item")
+        chunks = []
+        previewed = False
 
-Give me steps I can code TODAY, not abstract concepts.""",
-            
-            "content_creation": """Break down this project by content operations and distribution:
-- What content creation or curation process is needed?
-- What tools and workflows will streamline production?
-- How will content be organized and discovered?
-- What distribution channels make sense?
-- What's the minimum viable content strategy?""",
+        try:
+            # The slot is held for the whole stream, which is one in-flight request
+            async with _request_slots:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=self._plan_max_tokens(title, description, answers),
+                    response_format={"type": "json_object"},
+                    stream=True
+                )
             
-            "business_service": """Break down this project by business operations and value delivery:
-- What's the core value proposition and how is it delivered?
-- What operational processes are needed?
-- How will customers discover and engage with this?
-- What's the revenue model and pricing strategy?
-- What's the leanest path to first paying customer?""",
+                async for chunk in stream:
+                    content = chunk.choices[0].delta.content if chunk.choices else None
+                    if not content:
+                        continue
+                    chunks.append(content)
+                    summary_parser.send(content.encode())
+                    steps_parser.send(content.encode())
+                
+                    for summary in summaries:
+                        previewed = True
+                        yield {"event": "summary", "data": summary}
+                    # Steps are previews; the final plan below is fully validated,
+                    # so skip per-step validation here
+                    for step in steps:
+                        previewed = True
+                        yield {"event": "step", "data": PlanStep.model_construct(**step)}
+                    del summaries[:]
+                    del steps[:]
             
-            "research_analysis": """Break down this project by data collection and insight generation:
-- What data needs to be collected and from where?
-- What analysis methods will generate insights?
-- How will findings be validated and presented?
-- What tools enable efficient research workflow?
-- What's the minimum viable research output?""",
+            summary_parser.close()
+            steps_parser.close()
             
-            "application": """Break down this project by user experience and system design:
-- What are the core user flows and features?
-- What's the data model and state management approach?
-- What integrations or APIs are needed?
-- What's the simplest deployable version?
-- What are the key technical and UX decisions?""",
+            plan_json = "".join(chunks)
+            logger.info(f"Streamed plan for {project_type} project. Response length: {len(plan_json)}")
+            plan = PlanGenerationResponse.model_validate_json(plan_json)
             
-            "community_platform": """Break down this project by community dynamics and engagement:
-- What brings people together and keeps them engaged?
-- What moderation and governance is needed?
-- How will the community grow and stay healthy?
-- What features enable meaningful connections?
-- What's the minimum viable community experience?""",
+            yield {
+                "event": "plan",
+                "data": {
+                    "summary": plan.summary,
+                    "steps": plan.steps,
+                    "resources": plan.resources
+                }
+            }
             
-            "general": """Break down this project by its core components and dependencies:
-- What are the main functional components?
-- How do these components interact?
-- What are the critical dependencies?
-- What's the simplest working version?
-- What are the key decisions and trade-offs?"""
-        }
-        
-        breakdown_approach = context_templates.get(project_type, context_templates["general"])
-        
-        return f"""You are {persona} creating a CONCRETE, ACTIONABLE implementation plan.
-
-Original Idea:
-Title: "{title}"
-Description: "{description}"
-
-Refinement Details:
-{answers_text}
+        except Exception as e:
+            logger.error(f"Failed to stream plan for {project_type} project: {e}")
+            if previewed:
+                yield {"event": "error", "data": {"detail": f"Failed to generate plan: {str(e)}"}}
+            else:
+                yield {"event": "plan", "data": self._get_fallback_plan(title, description)}
 
-IMPORTANT: Give me SPECIFIC, EXECUTABLE steps with actual tool names, library choices, and implementation details.
-DO NOT give me generic advice like "Define requirements" or "Set up infrastructure".
-I want steps like "Install Scrapy with 'pip install scrapy'" or "Create PostgreSQL schema with these exact tables".
+    def _plan_max_tokens(self, title: str, description: str, answers: Dict[str, str]) -> int:
+        """
+        Output token budget for a plan, scaled to how much idea-specific input there is
+        (roughly 4 characters per token; the floor leaves room for a complete plan JSON)
+        """
+        idea_tokens = (len(title) + len(description) + sum(len(answer) for answer in answers.values())) // 4
+        return min(PLAN_MAX_TOKENS, PLAN_MIN_TOKENS + 2 * idea_tokens)
 
-{breakdown_approach}
+    def _build_plan_messages(
+        self, 
+        title: str, 
+        description: str, 
+        answers: Dict[str, str]
+    ) -> Tuple[str, str, List[Dict[str, str]]]:
+        """
+        Build the chat messages for plan generation
+        Returns: (project_type, persona, messages)
+        """
+        # Format answers for the prompt
+        answers_text = "\n".join([
+            f"Q: {question_id}\nA: {answer}" 
+            for question_id, answer in answers.items()
+        ])
 
-EVERY step must be something I can DO, not something to THINK ABOUT.
-Bad: "Design the data model"
-Good: "Create PostgreSQL tables: blogs(id, url, title, content, scraped_at), summaries(id, blog_id, summary_text)"
+        # Detect project type and get contextual prompt
+        project_type, persona = self._detect_project_type(title, description, answers)
+        prompt = self._get_contextual_prompt(project_type, persona, title, description, answers_text)
+        
+        messages = [
+            {"role": "system", "content": PLAN_SYSTEM_PROMPT.format_map({"persona": persona})},
+            {"role": "user", "content": prompt}
+        ]
+        return project_type, persona, messages
 
-Return ONLY a JSON object in this exact format:
-{{
-  "summary": "A clear paragraph describing the refined concept, its target users, and core value proposition...",
-  "steps": [
-    {{"order": 1, "title": "[Specific component/layer name]", "description": "[What this component does and why it's needed]", "estimated_time": "[Realistic time estimate]"}},
-    {{"order": 2, "title": "[Another specific component]", "description": "[Its purpose and implementation approach]", "estimated_time": "[Time estimate]"}}
-  ],
-  "resources": [
-    {{"title": "[Specific tool/service name]", "url": "[actual URL if applicable]", "type": "[tool/service/reference]", "description": "[Why this specific resource helps]"}}
-  ]
-}}
+    def _detect_project_type(self, title: str, description: str, answers: Dict[str, str] = None) -> Tuple[str, str]:
+        """
+        Detect the project type based on content to select appropriate prompt template
+        Returns: (project_type, persona)
+        """
+        combined_text = " ".join((title, description, *(answers.values() if answers else ())))
+        
+        for project_type, pattern in PROJECT_TYPE_PATTERNS:
+            if pattern.search(combined_text):
+                return project_type, PROJECT_PERSONAS[project_type]
+        return "general", PROJECT_PERSONAS["general"]
 
-Make each step and resource specific to this exact idea. Focus on WHAT needs to be built and HOW the pieces fit together."""
+    def _get_contextual_prompt(self, project_type: str, persona: str, title: str, description: str, answers_text: str) -> str:
+        """
+        Generate a context-aware prompt based on project type
+        """
+        breakdown_approach = BREAKDOWN_APPROACHES.get(project_type, BREAKDOWN_APPROACHES["general"])
+        
+        return PLAN_PROMPT_TEMPLATE.format_map({
+            "persona": persona,
+            "title": title,
+            "description": description,
+            "answers_text": answers_text,
+            "breakdown_approach": breakdown_approach
+        })
 
     def _get_fallback_questions(self) -> List[RefinementQuestion]:
         """Fallback questions if LLM fails"""
@@ -359,68 +683,38 @@ Make each step and resource specific to this exact idea. Focus on WHAT needs to
         # Try to detect project type even for fallback
         project_type, _ = self._detect_project_type(title, description)
         
-        # More contextual fallback steps based on project type
-        if project_type == "technical_tool":
-            steps = [
-                PlanStep(order=1, title="Install Scrapy & Setup Project", description="pip install scrapy beautifulsoup4 openai && scrapy startproject rv_scraper", estimated_time="30 minutes"),
-                PlanStep(order=2, title="Build RV Blog Spider", description="Create spider to crawl rvlife.com, loveyourrv.com, and rvwithmill.com - extract title, content, date", estimated_time="2-3 days"),
-                PlanStep(order=3, title="OpenAI Summarization Pipeline", description="Implement GPT-4 API calls with prompt: 'Extract key RV tips and insights from this blog post'", estimated_time="1 day"),
-                PlanStep(order=4, title="SQLite Storage with Deduplication", description="Create blogs table with URL hash index, implement 'seen URLs' check before processing", estimated_time="1 day"),
-                PlanStep(order=5, title="CLI Commands", description="python rv_scraper.py --scrape (fetch new) --summary ID (show summary) --export (JSON dump)", estimated_time="1 day")
-            ]
-        elif project_type == "content_creation":
-            steps = [
-                PlanStep(order=1, title="Content Strategy & Templates", description="Define content types and create templates", estimated_time="3-4 days"),
-                PlanStep(order=2, title="Creation Workflow", description="Set up tools and processes for content production", estimated_time="1 week"),
-                PlanStep(order=3, title="Organization System", description="Build categorization and tagging structure", estimated_time="3-4 days"),
-                PlanStep(order=4, title="Distribution Channels", description="Set up publishing and distribution methods", estimated_time="1 week"),
-                PlanStep(order=5, title="Analytics & Feedback", description="Implement tracking and audience feedback loops", estimated_time="3-4 days")
-            ]
-        else:
-            # Generic but still avoiding phase-based structure
-            steps = [
-                PlanStep(order=1, title="Core Functionality", description="Define and build the main value-delivering features", estimated_time="2-3 weeks"),
-                PlanStep(order=2, title="User Interface", description="Create the interface for user interaction", estimated_time="1-2 weeks"),
-                PlanStep(order=3, title="Data Management", description="Set up data storage and retrieval systems", estimated_time="1 week"),
-                PlanStep(order=4, title="Integration Points", description="Connect with necessary external services", estimated_time="1 week"),
-                PlanStep(order=5, title="Deployment & Operations", description="Set up hosting and operational processes", estimated_time="3-4 days")
-            ]
+        # Steps and resources are built once at import; only the summary varies per call
+        steps = FALLBACK_STEPS.get(project_type, FALLBACK_STEPS["general"])
         
         return {
             "summary": f"Implementation breakdown for '{title}': {description[:100]}... This is a fallback plan that should be refined with more specific details based on your requirements.",
-            "steps": steps,
-            "resources": [
-                PlanResource(title="Documentation Tool", type="tool", description="Use Notion, Obsidian, or similar for project documentation"),
-                PlanResource(title="Version Control", type="tool", description="Git repository for tracking changes and collaboration")
-            ]
+            "steps": list(steps),
+            "resources": list(FALLBACK_RESOURCES)
         }
 
     def generate_markdown(self, plan_data: Dict[str, Any], idea_title: str) -> str:
         """
         Generate markdown version of the plan
         """
-        markdown = f"""# {idea_title} - Implementation Plan
-
-## Summary
-{plan_data["summary"]}
-
-## Steps
-
-"""
+        parts = [
+            f"# {idea_title} - Implementation Plan\n\n",
+            f"## Summary\n{plan_data['summary']}\n\n",
+            "## Steps\n\n"
+        ]
         
         for step in plan_data["steps"]:
-            markdown += f"### {step.order}. {step.title}\n"
-            markdown += f"{step.description}\n"
+            parts.append(f"### {step.order}. {step.title}\n")
+            parts.append(f"{step.description}\n")
             if step.estimated_time:
-                markdown += f"**Estimated Time:** {step.estimated_time}\n"
-            markdown += "\n"
+                parts.append(f"**Estimated Time:** {step.estimated_time}\n")
+            parts.append("\n")
         
         if plan_data["resources"]:
-            markdown += "## Resources\n\n"
+            parts.append("## Resources\n\n")
             for resource in plan_data["resources"]:
-                markdown += f"- **{resource.title}**"
+                parts.append(f"- **{resource.title}**")
                 if resource.url:
-                    markdown += f" ([Link]({resource.url}))"
-                markdown += f" - {resource.description}\n"
+                    parts.append(f" ([Link]({resource.url}))")
+                parts.append(f" - {resource.description}\n")
         
-        return markdown
\ No newline at end of file
+        return "".join(parts)
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Database-backed cache of LLM completions, keyed by a hash of the full request
+"""
+import hashlib
+import logging
+import orjson
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from config import settings
+from database import SessionLocal
+from models import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(request: Dict[str, Any]) -> str:
+    """SHA-256 of the request parameters (model, messages, temperature, ...)"""
+    return hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def get_cached_completion(key: str) -> Optional[str]:
+    """Return the cached completion content for key, unless missing or expired"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl)
+    try:
+        with SessionLocal() as db:
+            return db.query(LLMCacheEntry.content).filter(
+                LLMCacheEntry.key == key,
+                LLMCacheEntry.created_at > cutoff
+            ).scalar()
+    except SQLAlchemyError as e:
+        # A cache miss just means a fresh LLM call, so never let the cache fail a request
+        logger.warning(f"LLM cache lookup failed: {e}")
+        return None
+
+
+def store_completion(key: str, content: str) -> None:
+    """Store a completion, replacing any expired entry under the same key"""
+    now = datetime.utcnow()
+    statement = insert(LLMCacheEntry).values(key=key, content=content, created_at=now)
+    statement = statement.on_conflict_do_update(
+        index_elements=[LLMCacheEntry.key],
+        set_={"content": statement.excluded.content, "created_at": statement.excluded.created_at}
+    )
+    try:
+        with SessionLocal() as db:
+            db.execute(statement)
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"LLM cache store failed: {e}")
+
+
+def purge_expired_completions() -> int:
+    """Delete entries older than the TTL (run periodically); returns the number removed"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl)
+    try:
+        with SessionLocal() as db:
+            deleted = db.query(LLMCacheEntry).filter(
+                LLMCacheEntry.created_at <= cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+        return deleted
+    except SQLAlchemyError as e:
+        logger.warning(f"LLM cache purge failed: {e}")
+        return 0
@@ -1,12 +1,64 @@
 """
 Plan parsing utilities for converting markdown/text into structured plan data
 """
+import hashlib
 import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Tuple
 from schemas import PlanStep, PlanResource
 
+# Patterns used on every line of an uploaded plan, compiled once at import
+# Section headers ("## ...", also "### ..." and deeper) at the start of a line
+SECTION_HEADER_RE = re.compile(r'^[ \t]*##(.*)$', re.MULTILINE)
+# Step header in a single alternation, tried in this order:
+# "1. Step title", "- Step title" / "* Step title", "### Step title"
+STEP_RE = re.compile(r'^(?:\d+\.\s*(?P<numbered>.+)|[-*]\s*(?P<bullet>.+)|#{1,4}\s*(?P<header>.+))')
+TIME_ESTIMATE_RE = re.compile(r'\((?:time:|duration:|estimate:)?\s*([^)]+)\)', re.IGNORECASE)
+MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+BULLET_RE = re.compile(r'^[-*]\s*')
+LEADING_DASH_RE = re.compile(r'^\s*-\s*')
+TITLE_MARKER_RE = re.compile(r'^[*#-]\s*')
+# Resource keywords by type, in priority order. Keywords match anywhere in the text
+# (substrings, like "api" in "APIs"); the lookahead keeps matches from overlapping
+# away a keyword that starts inside another one
+RESOURCE_TYPES = ("service", "tool", "article", "repository")
+RESOURCE_TYPE_RE = re.compile(
+    r'(?=(?P<service>api|service|platform|subscription)'
+    r'|(?P<tool>library|framework|tool|software|cli|package)'
+    r'|(?P<article>article|blog|tutorial|guide|documentation|docs)'
+    r'|(?P<repository>github|repo|repository|code))',
+    re.IGNORECASE
+)
+
+# Parsed plans keyed by a hash of the uploaded content, so re-uploads and retries skip re-parsing
+PARSE_CACHE_SIZE = 256
+parse_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
 
 def parse_markdown_plan(content: str) -> Dict[str, Any]:
+    """
+    Parse markdown/text content into structured plan data, reusing the result
+    for content that was parsed recently
+    """
+    cache_key = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    parsed = parse_cache.get(cache_key)
+    if parsed is not None:
+        parse_cache.move_to_end(cache_key)
+    else:
+        parsed = _parse_markdown_plan(content)
+        parse_cache[cache_key] = parsed
+        if len(parse_cache) > PARSE_CACHE_SIZE:
+            parse_cache.popitem(last=False)
+    
+    # Fresh containers so callers can't alter the cached result
+    return {
+        "summary": parsed["summary"],
+        "steps": list(parsed["steps"]),
+        "resources": list(parsed["resources"])
+    }
+
+
+def _parse_markdown_plan(content: str) -> Dict[str, Any]:
     """
     Parse markdown/text content into structured plan data
     
@@ -24,61 +76,29 @@ def parse_markdown_plan(content: str) -> Dict[str, Any]:
     - Tool name - description
     - [Tool name](url) - description
     """
-    lines = content.strip().split('\n')
-    
     summary = ""
     steps = []
     resources = []
-    
-    current_section = None
-    current_content = []
     step_order = 1
     
-    for line in lines:
-        line = line.strip()
-        if not line:
+    # One split partitions the document: [preamble, header, body, header, body, ...].
+    # The preamble (main title and anything before the first section) is ignored.
+    parts = SECTION_HEADER_RE.split(content)
+    for header, body in zip(parts[1::2], parts[2::2]):
+        # Section content: non-empty lines, skipping any single-# title lines
+        section_lines = [line for line in (raw.strip() for raw in body.split('\n')) if line and not line.startswith('#')]
+        if not section_lines:
             continue
-            
-        # Detect section headers
-        if line.startswith('##'):
-            # Process previous section
-            if current_section and current_content:
-                if current_section == 'summary':
-                    summary = '\n'.join(current_content).strip()
-                elif current_section == 'steps':
-                    steps.extend(_parse_steps('\n'.join(current_content), step_order))
-                    step_order += len(steps)
-                elif current_section == 'resources':
-                    resources.extend(_parse_resources('\n'.join(current_content)))
-            
-            # Start new section
-            current_content = []
-            section_header = line.lower()
-            if 'summary' in section_header:
-                current_section = 'summary'
-            elif any(word in section_header for word in ['step', 'implementation', 'plan', 'breakdown']):
-                current_section = 'steps'
-            elif any(word in section_header for word in ['resource', 'tool', 'reference', 'link']):
-                current_section = 'resources'
-            else:
-                current_section = None
-                
-        elif line.startswith('#'):
-            # Skip main title, but could extract it later
-            continue
-        else:
-            # Add to current section content
-            if current_section:
-                current_content.append(line)
-    
-    # Process final section
-    if current_section and current_content:
-        if current_section == 'summary':
-            summary = '\n'.join(current_content).strip()
-        elif current_section == 'steps':
-            steps.extend(_parse_steps('\n'.join(current_content), step_order))
-        elif current_section == 'resources':
-            resources.extend(_parse_resources('\n'.join(current_content)))
+        
+        section_header = header.lower()
+        if 'summary' in section_header:
+            summary = '\n'.join(section_lines).strip()
+        elif any(word in section_header for word in ['step', 'implementation', 'plan', 'breakdown']):
+            section_steps = _parse_steps(section_lines, step_order)
+            steps.extend(section_steps)
+            step_order += len(section_steps)
+        elif any(word in section_header for word in ['resource', 'tool', 'reference', 'link']):
+            resources.extend(_parse_resources(section_lines))
     
     # If no explicit sections found, try to parse the whole content
     if not summary and not steps and not resources:
@@ -95,19 +115,10 @@ def parse_markdown_plan(content: str) -> Dict[str, Any]:
     }
 
 
-def _parse_steps(content: str, start_order: int = 1) -> List[PlanStep]:
-    """Parse steps from content"""
+def _parse_steps(lines: List[str], start_order: int = 1) -> List[PlanStep]:
+    """Parse steps from content lines, numbered consecutively from start_order"""
     steps = []
     order = start_order
-    
-    # Look for numbered lists, bullet points, or markdown headers
-    step_patterns = [
-        r'^(\d+)\.\s*(.+)',  # 1. Step title
-        r'^[-*]\s*(.+)',     # - Step title or * Step title  
-        r'^#{1,4}\s*(.+)',   # ### Step title
-    ]
-    
-    lines = content.split('\n')
     current_step = None
     
     for line in lines:
@@ -115,27 +126,18 @@ def _parse_steps(content: str, start_order: int = 1) -> List[PlanStep]:
         if not line:
             continue
             
-        # Check if this is a step header
-        step_match = None
-        for pattern in step_patterns:
-            match = re.match(pattern, line)
-            if match:
-                step_match = match
-                break
+        # Check if this is a step header (numbered list, bullet point, or markdown header);
+        # plain description lines can't start with a marker, so they skip the regex
+        step_match = STEP_RE.match(line) if line[0] in '-*#' or line[0].isdecimal() else None
         
         if step_match:
             # Save previous step
             if current_step:
                 steps.append(current_step)
             
-            # Extract step info
-            if pattern.startswith(r'^(\d+)'):
-                # Numbered list - use the number
-                step_title = step_match.group(2)
-                order = int(step_match.group(1))
-            else:
-                # Bullet or header - use sequential order
-                step_title = step_match.group(1)
+            # Extract step info; list numbers are dropped so orders stay consecutive
+            # across sections even when each section restarts its numbering at 1
+            step_title = step_match['numbered'] or step_match['bullet'] or step_match['header']
             
             # Parse title and description
             title, description, time_estimate = _parse_step_details(step_title)
@@ -166,13 +168,12 @@ def _parse_steps(content: str, start_order: int = 1) -> List[PlanStep]:
 def _parse_step_details(step_text: str) -> Tuple[str, str, str]:
     """Parse step text to extract title, description, and time estimate"""
     # Look for time estimates in parentheses
-    time_pattern = r'\((?:time:|duration:|estimate:)?\s*([^)]+)\)'
-    time_match = re.search(time_pattern, step_text, re.IGNORECASE)
+    time_match = TIME_ESTIMATE_RE.search(step_text)
     time_estimate = None
     
     if time_match:
         time_estimate = time_match.group(1).strip()
-        step_text = re.sub(time_pattern, '', step_text, flags=re.IGNORECASE).strip()
+        step_text = TIME_ESTIMATE_RE.sub('', step_text).strip()
     
     # Split title and description by common separators
     separators = [' - ', ': ', ' – ', ' — ']
@@ -187,32 +188,31 @@ def _parse_step_details(step_text: str) -> Tuple[str, str, str]:
             break
     
     # Clean up title
-    title = re.sub(r'^[*#-]\s*', '', title).strip()
+    title = TITLE_MARKER_RE.sub('', title).strip()
     
     return title, description, time_estimate
 
 
-def _parse_resources(content: str) -> List[PlanResource]:
-    """Parse resources from content"""
+def _parse_resources(lines: List[str]) -> List[PlanResource]:
+    """Parse resources from content lines"""
     resources = []
     
-    lines = content.split('\n')
     for line in lines:
         line = line.strip()
         if not line or line.startswith('#'):
             continue
         
         # Remove bullet points
-        line = re.sub(r'^[-*]\s*', '', line)
+        line = BULLET_RE.sub('', line)
         
         # Look for markdown links [title](url)
-        link_match = re.search(r'\[([^\]]+)\]\(([^)]+)\)', line)
+        link_match = MARKDOWN_LINK_RE.search(line)
         if link_match:
             title = link_match.group(1)
             url = link_match.group(2)
             # Remove the link from description
-            description = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', '', line).strip()
-            description = re.sub(r'^\s*-\s*', '', description).strip()
+            description = MARKDOWN_LINK_RE.sub('', line).strip()
+            description = LEADING_DASH_RE.sub('', description).strip()
         else:
             # No link, parse title - description format
             url = None
@@ -236,18 +236,16 @@ def _parse_resources(content: str) -> List[PlanResource]:
 
 def _detect_resource_type(title: str, description: str) -> str:
     """Detect resource type from title and description"""
-    combined = f"{title} {description}".lower()
+    combined = f"{title} {description}"
     
-    if any(word in combined for word in ['api', 'service', 'platform', 'subscription']):
-        return "service"
-    elif any(word in combined for word in ['library', 'framework', 'tool', 'software', 'cli', 'package']):
-        return "tool"
-    elif any(word in combined for word in ['article', 'blog', 'tutorial', 'guide', 'documentation', 'docs']):
-        return "article"
-    elif any(word in combined for word in ['github', 'repo', 'repository', 'code']):
-        return "repository"
-    else:
-        return "tool"  # Default
+    # One scan finds every keyword; the earliest category in RESOURCE_TYPES wins
+    best = len(RESOURCE_TYPES)
+    for match in RESOURCE_TYPE_RE.finditer(combined):
+        best = min(best, RESOURCE_TYPES.index(match.lastgroup))
+        if best == 0:
+            break
+    
+    return RESOURCE_TYPES[best] if best < len(RESOURCE_TYPES) else "tool"  # Default
 
 
 def _parse_unstructured_content(content: str) -> Dict[str, Any]:
@@ -258,7 +256,7 @@ def _parse_unstructured_content(content: str) -> Dict[str, Any]:
     summary = paragraphs[0] if paragraphs else "Uploaded implementation plan"
     
     # Look for any numbered or bulleted items as steps
-    steps = _parse_steps(content)
+    steps = _parse_steps(content.split('\n'))
     
     # If no structured steps found, create a single step with all content
     if not steps:
@@ -0,0 +1,65 @@
+"""
+pgvector-backed semantic cache of generated plans, keyed by idea embeddings
+Lookups span all ideas so near-duplicates ("MVP of X" vs "X MVP") share a plan; each row
+keeps its source idea so deleting that idea also removes the plans generated from it
+"""
+import logging
+import orjson
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from config import settings
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def find_similar_plan(embedding: List[float]) -> Optional[str]:
+    """Return the cached plan JSON for the nearest unexpired embedding, if similar enough"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl)
+    try:
+        with SessionLocal() as db:
+            row = db.execute(text("""
+                SELECT plan_json, 1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
+                FROM idea_plan_cache
+                WHERE created_at > :cutoff
+                ORDER BY embedding <=> CAST(:embedding AS vector)
+                LIMIT 1
+            """), {"embedding": orjson.dumps(embedding).decode(), "cutoff": cutoff}).first()
+    except SQLAlchemyError as e:
+        # A miss just means a fresh LLM call, so never let the cache fail a request
+        logger.warning(f"Semantic cache lookup failed: {e}")
+        return None
+    
+    if row is None or row.similarity < settings.semantic_cache_threshold:
+        return None
+    logger.info(f"Semantic cache hit (similarity {row.similarity:.3f})")
+    return row.plan_json
+
+
+def store_plan(idea_id: UUID, embedding: List[float], plan_json: str) -> None:
+    """Store a generated plan under its embedding, tied to the idea it was generated for"""
+    try:
+        with SessionLocal() as db:
+            db.execute(text("""
+                INSERT INTO idea_plan_cache (idea_id, embedding, plan_json)
+                VALUES (:idea_id, CAST(:embedding AS vector), :plan_json)
+            """), {"idea_id": str(idea_id), "embedding": orjson.dumps(embedding).decode(), "plan_json": plan_json})
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.warning(f"Semantic cache store failed: {e}")
+
+
+def purge_expired_plans() -> int:
+    """Delete cached plans older than the TTL (run periodically); returns the number removed"""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.llm_cache_ttl)
+    try:
+        with SessionLocal() as db:
+            result = db.execute(text("DELETE FROM idea_plan_cache WHERE created_at <= :cutoff"), {"cutoff": cutoff})
+            db.commit()
+        return result.rowcount
+    except SQLAlchemyError as e:
+        logger.warning(f"Semantic cache purge failed: {e}")
+        return 0